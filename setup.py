@@ -65,7 +65,21 @@ setup(
         ],
         'mysql': [
             'mysqlclient==1.3.12',
-        ]
+        ],
+        'compress': [
+            'brotli',
+            'zstandard',
+        ],
+        'binary': [
+            'msgpack',
+            'cbor2',
+        ],
+        'orjson': [
+            'orjson',
+        ],
+        'async': [
+            'gevent',
+        ],
     },
     entry_points={
         'console_scripts': [
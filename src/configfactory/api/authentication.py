@@ -1,5 +1,7 @@
-from typing import Optional
+from typing import FrozenSet, NamedTuple, Optional, Union
 
+from django.conf import settings
+from django.contrib.auth.models import Group
 from django.utils.translation import ugettext_lazy as _
 from rest_framework import exceptions
 from rest_framework.authentication import (
@@ -7,24 +9,65 @@ from rest_framework.authentication import (
 )
 
 from configfactory.models import APISettings, User
+from configfactory.services.environments import (
+    get_user_or_group_view_environments,
+)
+from configfactory.utils.cache import LRUCache
+
+
+class TokenCredentials(NamedTuple):
+    user_or_group: Union[User, Group]
+    environments: FrozenSet[str]
 
 
 class TokenAuthentication(BaseTokenAuthentication):
 
     def authenticate_credentials(self, key):
 
-        api_config: Optional[APISettings] = (
-            APISettings
-            .objects
-            .active()
-            .filter(token=key)
-            .first()
-        )
+        credentials: Optional[TokenCredentials] = _credentials_cache.get(key)
+
+        if credentials is None:
+            credentials = _get_credentials(key)
+            _credentials_cache.set(key, credentials)
+
+        return credentials.user_or_group, credentials
+
+
+def clear_credentials_cache():
+    """
+    Clear cached token credentials.
+    """
+    _credentials_cache.clear()
+
 
-        if not api_config:
-            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+def _get_credentials(key) -> TokenCredentials:
 
-        if isinstance(api_config.user_or_group, User) and not api_config.user_or_group.is_active:
-            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+    api_config: Optional[APISettings] = (
+        APISettings
+        .objects
+        .active()
+        .filter(token=key)
+        .first()
+    )
 
-        return api_config.user_or_group, None
+    if not api_config:
+        raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+    user_or_group = api_config.user_or_group
+
+    if isinstance(user_or_group, User) and not user_or_group.is_active:
+        raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+    environments = get_user_or_group_view_environments(user_or_group=user_or_group)
+
+    return TokenCredentials(
+        user_or_group=user_or_group,
+        environments=frozenset(environments.values_list('alias', flat=True)),
+    )
+
+
+# Per process cache, other workers pick up changes after TTL
+_credentials_cache = LRUCache(
+    maxsize=settings.API_TOKEN_CACHE_SIZE,
+    ttl=settings.API_TOKEN_CACHE_TTL,
+)
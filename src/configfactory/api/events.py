@@ -0,0 +1,102 @@
+import time
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+
+from configfactory import configstore, registry
+from configfactory.models import Environment
+from configfactory.services.configsettings import get_environment_settings
+from configfactory.utils import dictutil, json
+
+_missing = object()
+
+
+def is_supported() -> bool:
+    """
+    Check whether events can be streamed without holding a server
+    thread per client, i.e. in async (gevent) server mode.
+    """
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+
+def settings_events(environment: Environment, keys: bool = False) -> Iterator[str]:
+    """
+    Stream environment settings changes as server-sent events.
+
+    One `change` event is emitted per changed component, carrying
+    component alias, store version and optionally changed flattened keys.
+    Stream ends after `API_EVENTS_TIMEOUT` seconds, clients are
+    expected to reconnect. Streams hold a server thread unless
+    served in async server mode, see `is_supported`.
+    """
+
+    with configstore.cached_data():
+        version = configstore.get_version()
+        components = _get_components_settings(environment)
+
+    yield format_event('version', {'version': version}, event_id=version)
+
+    now = time.monotonic()
+    deadline = now + settings.API_EVENTS_TIMEOUT
+    heartbeat_at = now + settings.API_EVENTS_HEARTBEAT
+
+    while time.monotonic() < deadline:
+
+        time.sleep(settings.API_WAIT_INTERVAL)
+
+        with configstore.cached_data():
+            new_version = configstore.get_version()
+            if new_version != version:
+                new_components = _get_components_settings(environment)
+            else:
+                new_components = None
+
+        if new_components is not None:
+            version = new_version
+            for alias in sorted(components.keys() | new_components.keys()):
+                old_data = components.get(alias, {})
+                new_data = new_components.get(alias, {})
+                if old_data == new_data:
+                    continue
+                data = {
+                    'component': alias,
+                    'version': version,
+                }
+                if keys:
+                    data['keys'] = _changed_keys(alias, old_data, new_data)
+                heartbeat_at = time.monotonic() + settings.API_EVENTS_HEARTBEAT
+                yield format_event('change', data, event_id=version)
+            components = new_components
+
+        if time.monotonic() >= heartbeat_at:
+            heartbeat_at = time.monotonic() + settings.API_EVENTS_HEARTBEAT
+            yield ': heartbeat\n\n'
+
+
+def format_event(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    """
+    Format server-sent event.
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, compress=True)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def _get_components_settings(environment: Environment) -> Dict[str, dict]:
+    return get_environment_settings(environment, registry.get_components())
+
+
+def _changed_keys(alias: str, old_data: dict, new_data: dict) -> List[str]:
+    old_data = dictutil.flatten({alias: old_data})
+    new_data = dictutil.flatten({alias: new_data})
+    return sorted(
+        key for key in old_data.keys() | new_data.keys()
+        if old_data.get(key, _missing) != new_data.get(key, _missing)
+    )
@@ -0,0 +1,108 @@
+import gzip
+import threading
+from typing import Callable, Dict, Hashable, Optional
+
+from django.conf import settings
+
+from configfactory.utils.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+IDENTITY = 'identity'
+
+
+class Payload:
+    """
+    Rendered response content with lazily compressed variants.
+    """
+
+    def __init__(self, content: bytes, content_type: str):
+        self.content_type = content_type
+        self._content: Dict[str, bytes] = {IDENTITY: content}
+        self._lock = threading.Lock()
+
+    def encode(self, encoding: str = IDENTITY) -> bytes:
+        content = self._content.get(encoding)
+        if content is None:
+            with self._lock:
+                content = self._content.get(encoding)
+                if content is None:
+                    content = compressors[encoding](self._content[IDENTITY])
+                    self._content[encoding] = content
+        return content
+
+
+def get_payload(key: Hashable) -> Optional[Payload]:
+    """
+    Get rendered payload.
+    """
+    return _payloads.get(key)
+
+
+def set_payload(key: Hashable, payload: Payload):
+    """
+    Store rendered payload.
+    """
+    _payloads.set(key, payload)
+
+
+def clear_payloads():
+    """
+    Clear rendered payloads.
+    """
+    _payloads.clear()
+
+
+def get_accepted_encoding(accept_encoding: str) -> str:
+    """
+    Get best supported content encoding of Accept-Encoding header.
+
+    Encoding of highest client quality is chosen, ties are broken
+    by server preference. Identity wins only if explicitly preferred.
+    """
+    accepted = {}
+    for item in accept_encoding.split(','):
+        encoding, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[encoding.strip().lower()] = quality
+    best_encoding, best_quality = IDENTITY, 0.0
+    for encoding in compressors:
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best_encoding, best_quality = encoding, quality
+    if accepted.get(IDENTITY, 0.0) > best_quality:
+        return IDENTITY
+    return best_encoding
+
+
+def _get_compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    # Ordered by preference
+    ret = {}
+    if brotli is not None:
+        ret['br'] = brotli.compress
+    if zstandard is not None:
+        # Compressor instances are not thread-safe
+        ret['zstd'] = lambda content: zstandard.ZstdCompressor().compress(content)
+    ret['gzip'] = gzip.compress
+    return ret
+
+
+compressors = _get_compressors()
+
+# Keyed by store version, so stale payloads are evicted as LRU
+_payloads = LRUCache(maxsize=settings.API_PAYLOAD_CACHE_SIZE)
@@ -1,7 +1,18 @@
 from rest_framework import renderers
 
+from configfactory.api.events import format_event
 from configfactory.utils import dotenv
 
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover
+    cbor2 = None
+
 
 class DotEnvRenderer(renderers.BaseRenderer):
     media_type = 'text/dotenv'
@@ -9,3 +20,41 @@ class DotEnvRenderer(renderers.BaseRenderer):
 
     def render(self, data, media_type=None, renderer_context=None):
         return dotenv.dumps(data)
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+
+    def render(self, data, media_type=None, renderer_context=None):
+        return msgpack.packb(data, use_bin_type=True)
+
+
+class CBORRenderer(renderers.BaseRenderer):
+    media_type = 'application/cbor'
+    format = 'cbor'
+    charset = None
+
+    def render(self, data, media_type=None, renderer_context=None):
+        return cbor2.dumps(data)
+
+
+class EventStreamRenderer(renderers.BaseRenderer):
+    media_type = 'text/event-stream'
+    format = 'events'
+
+    def render(self, data, media_type=None, renderer_context=None):
+        # Only errors are rendered, event streams are written directly
+        return format_event('error', data)
+
+
+# Binary renderers available with installed optional dependencies
+binary_renderer_classes = tuple(
+    renderer_class
+    for renderer_class, module in (
+        (MessagePackRenderer, msgpack),
+        (CBORRenderer, cbor2),
+    )
+    if module is not None
+)
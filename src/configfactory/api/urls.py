@@ -1,6 +1,11 @@
 from django.urls import path
 
-from configfactory.api.views import EnvironmentsAPIView, SettingsAPIView
+from configfactory.api.views import (
+    BatchSettingsAPIView,
+    EnvironmentsAPIView,
+    SettingsAPIView,
+    SettingsEventsAPIView,
+)
 
 app_name = 'api'
 
@@ -10,6 +15,14 @@ urlpatterns = [
          view=EnvironmentsAPIView.as_view(),
          name='environments'),
 
+    path('batch/',
+         view=BatchSettingsAPIView.as_view(),
+         name='batch_settings'),
+
+    path('<environment>/events/',
+         view=SettingsEventsAPIView.as_view(),
+         name='settings_events'),
+
     path('<environment>/',
          view=SettingsAPIView.as_view(),
          name='settings'),
@@ -17,4 +30,12 @@ urlpatterns = [
     path('<environment>.<format>',
          view=SettingsAPIView.as_view(),
          name='settings_format'),
+
+    path('<environment>/<component>/',
+         view=SettingsAPIView.as_view(),
+         name='component_settings'),
+
+    path('<environment>/<component>.<format>',
+         view=SettingsAPIView.as_view(),
+         name='component_settings_format'),
 ]
@@ -1,18 +1,42 @@
+import hashlib
+import time
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
 from django.utils.functional import cached_property
-from rest_framework.generics import get_object_or_404
+from django.utils.http import quote_etag
+from django.utils.translation import ugettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ParseError
 from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView as BaseAPIView
 
+from configfactory import configstore, registry
+from configfactory.api import events
 from configfactory.api.authentication import TokenAuthentication
+from configfactory.api.payloads import (
+    IDENTITY,
+    Payload,
+    get_accepted_encoding,
+    get_payload,
+    set_payload,
+)
 from configfactory.api.permissions import IsAuthenticated
-from configfactory.api.renderers import DotEnvRenderer
+from configfactory.api.renderers import (
+    DotEnvRenderer,
+    EventStreamRenderer,
+    binary_renderer_classes,
+)
 from configfactory.api.serializers import EnvironmentSerializer
 from configfactory.mixins import ConfigStoreCachedMixin
-from configfactory.services.configsettings import get_environment_settings
-from configfactory.services.environments import (
-    get_user_or_group_view_environments,
+from configfactory.models import Component, Environment
+from configfactory.services.configsettings import (
+    get_environment_settings,
+    get_environments_settings,
 )
 from configfactory.utils import dictutil
 
@@ -26,8 +50,18 @@ class APIView(BaseAPIView):
     permission_classes = (IsAuthenticated,)
 
     @cached_property
-    def environments(self):
-        return get_user_or_group_view_environments(user_or_group=self.request.user)
+    def environments(self) -> List[Environment]:
+        return [
+            environment
+            for environment in registry.get_environments()
+            if environment.is_active and environment.alias in self.request.auth.environments
+        ]
+
+    def get_environment(self, alias: str) -> Environment:
+        environment = registry.get_environment(alias)
+        if environment is None or environment not in self.environments:
+            raise NotFound()
+        return environment
 
 
 class EnvironmentsAPIView(APIView):
@@ -48,9 +82,189 @@ class SettingsAPIView(ConfigStoreCachedMixin, APIView):
     renderer_classes = (
         JSONRenderer,
         DotEnvRenderer,
+        *binary_renderer_classes,
     )
 
-    def get(self, request, environment: str, **kwargs):
-        environment = get_object_or_404(self.environments, alias=environment)
-        data = dictutil.flatten(get_environment_settings(environment))
-        return Response(data)
+    def get(self, request, environment: str, component: str = None, **kwargs):
+        environment = self.get_environment(environment)
+        components = self.get_components(component)
+        wait, version = self.get_wait_params()
+        data = None
+        if wait and version == configstore.get_version():
+            data = self.wait_for_changes(environment, components, wait)
+        payload_key = self.get_payload_key(environment, components)
+        encoding = get_accepted_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        etag = self.get_etag(payload_key, encoding)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            payload = get_payload(payload_key)
+            if payload is None:
+                if data is None:
+                    data = self.get_data(environment, components)
+                payload = self.render_payload(data)
+                set_payload(payload_key, payload)
+            response = HttpResponse(payload.encode(encoding), content_type=payload.content_type)
+            if encoding != IDENTITY:
+                response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        response['ETag'] = etag
+        response['X-Settings-Version'] = configstore.get_version()
+        return response
+
+    def get_components(self, component: str = None) -> List[Component]:
+        """
+        Get requested components, limited by key prefix if any.
+        """
+        if component is not None:
+            component = registry.get_component(component)
+            if component is None:
+                raise NotFound()
+            return [component]
+        components = registry.get_components()
+        prefix = self.request.query_params.get('prefix')
+        if prefix:
+            components = [
+                component for component in components
+                if component.alias.startswith(prefix) or prefix.startswith(f'{component.alias}.')
+            ]
+        return components
+
+    def get_data(self, environment: Environment, components: List[Component]) -> dict:
+        """
+        Get flattened environment settings of components.
+        """
+        data = dictutil.flatten(get_environment_settings(environment, components))
+        prefix = self.request.query_params.get('prefix')
+        if prefix:
+            data = {key: value for key, value in data.items() if key.startswith(prefix)}
+        return data
+
+    def get_wait_params(self) -> Tuple[float, Optional[int]]:
+        """
+        Get wait timeout and client known settings version.
+        Requests wait in async server mode only, as waiting
+        would hold a worker thread otherwise.
+        """
+        params = self.request.query_params
+        try:
+            wait = float(params.get('wait', 0))
+            version = params.get('version')
+            version = int(version) if version is not None else None
+        except ValueError:
+            raise ParseError(_('Wait and version parameters must be numbers.'))
+        if not events.is_supported():
+            wait = 0
+        return min(max(wait, 0), settings.API_WAIT_TIMEOUT), version
+
+    def wait_for_changes(self, environment: Environment, components: List[Component], wait: float) -> dict:
+        """
+        Wait until environment settings change or timeout expires.
+        Store changes not affecting environment settings are skipped.
+        """
+        data = self.get_data(environment, components)
+        version = configstore.get_version()
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(min(settings.API_WAIT_INTERVAL, max(deadline - time.monotonic(), 0)))
+            configstore.reset_cached_data()
+            if configstore.get_version() == version:
+                continue
+            version = configstore.get_version()
+            new_data = self.get_data(environment, components)
+            if new_data != data:
+                return new_data
+        return data
+
+    def get_payload_key(self, environment: Environment, components: List[Component]) -> tuple:
+        """
+        Get rendered payload key of current store version
+        and environment fallback chain.
+        """
+        return (
+            configstore.get_version(),
+            registry.get_environment_layers(environment.alias),
+            tuple(component.alias for component in components),
+            self.request.query_params.get('prefix', ''),
+            self.request.accepted_media_type,
+        )
+
+    def get_etag(self, payload_key: tuple, encoding: str) -> str:
+        """
+        Get response entity tag of rendered payload.
+        """
+        user_or_group = self.request.user
+        value = ':'.join(map(str, payload_key + (
+            encoding,
+            user_or_group._meta.label_lower,
+            user_or_group.pk,
+        )))
+        return quote_etag(hashlib.sha1(value.encode()).hexdigest())
+
+    def render_payload(self, data: dict) -> Payload:
+        """
+        Render payload with accepted renderer.
+        """
+        renderer = self.request.accepted_renderer
+        media_type = self.request.accepted_media_type
+        content = renderer.render(data, media_type, self.get_renderer_context())
+        if renderer.charset:
+            if isinstance(content, str):
+                content = content.encode(renderer.charset)
+            media_type = f'{media_type}; charset={renderer.charset}'
+        return Payload(content, content_type=media_type)
+
+
+class BatchSettingsAPIView(APIView):
+
+    renderer_classes = (
+        JSONRenderer,
+        *binary_renderer_classes,
+    )
+
+    def get(self, request):
+        aliases = [
+            alias.strip()
+            for alias in request.query_params.get('environments', '').split(',')
+            if alias.strip()
+        ]
+        if not aliases:
+            raise ParseError(_('Environments parameter is required.'))
+        environments = {
+            environment.alias: environment
+            for environment in self.environments
+            if environment.alias in aliases
+        }
+        missing = [alias for alias in aliases if alias not in environments]
+        if missing:
+            raise NotFound(_('Environments not found: %(aliases)s.') % {
+                'aliases': ', '.join(missing)
+            })
+        settings_dict = get_environments_settings(environments[alias] for alias in aliases)
+        return Response({
+            alias: dictutil.flatten(env_settings)
+            for alias, env_settings in settings_dict.items()
+        })
+
+
+class SettingsEventsAPIView(APIView):
+
+    renderer_classes = (
+        EventStreamRenderer,
+    )
+
+    def get(self, request, environment: str):
+        environment = self.get_environment(environment)
+        if not events.is_supported():
+            # Every stream would hold one of few server threads
+            return Response(
+                {'detail': _('Settings events require async server mode.')},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        keys = request.query_params.get('keys', '').lower() in ('1', 'true', 'yes')
+        response = StreamingHttpResponse(
+            events.settings_events(environment, keys=keys),
+            content_type=EventStreamRenderer.media_type,
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
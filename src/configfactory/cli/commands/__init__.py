@@ -1,7 +1,6 @@
 from multiprocessing import Process, cpu_count
 
 import click
-from django.core.management import execute_from_command_line
 
 from configfactory.support import env
 from configfactory.support.config import config
@@ -45,6 +44,26 @@ def init_command(config_path):
     type=click.INT,
     default=cpu_count()
 )
+@click.option(
+    '--threads',
+    help='The number of worker threads for handling requests.',
+    type=click.INT,
+    default=config.getint('server.threads', default=4)
+)
+@click.option(
+    'async_mode',
+    '--async',
+    help='Serve requests with cooperative gevent workers, '
+         'suited for many concurrent waiting API clients.',
+    default=config.getbool('server.async', default=False),
+    is_flag=True
+)
+@click.option(
+    '--worker-connections',
+    help='The maximum number of concurrent clients per async worker.',
+    type=click.INT,
+    default=config.getint('server.worker_connections', default=1000)
+)
 @click.option(
     '--reload',
     help='Restart workers when code changes.',
@@ -54,6 +73,17 @@ def init_command(config_path):
 def start_command(**options):
     """Start ConfigFactory."""
 
+    if options.pop('async_mode'):
+        try:
+            from gevent import monkey
+        except ImportError:
+            raise click.UsageError('Async mode requires gevent, install `configfactory[async]`.')
+        # Patch before Django is imported, so thread locals of
+        # store cache and database connections are per greenlet.
+        monkey.patch_all()
+        options['worker_class'] = 'gevent'
+        options['threads'] = None
+
     from configfactory import scheduler
     from configfactory.support.server import ConfigFactoryServer
 
@@ -89,6 +119,8 @@ def django_group(ctx, argv):
     Django commands.
     """
 
+    from django.core.management import execute_from_command_line
+
     execute_from_command_line(
         argv=[ctx.command_path] + list(argv)
     )
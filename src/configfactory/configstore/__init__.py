@@ -1,25 +1,34 @@
 import contextlib
 import threading
-from typing import Dict
+from typing import Dict, Iterable, Tuple
 
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.functional import LazyObject
 
 from configfactory.configstore.base import ConfigStore
 from configfactory.configstore.database import DatabaseConfigStore
-from configfactory.configstore.filesystem import FileSystemConfigStore
+from configfactory.configstore.filesystem import (
+    FileSystemConfigStore,
+    LiveFileSystemConfigStore,
+)
 from configfactory.configstore.memory import MemoryConfigStore
-from configfactory.utils import dictutil, iterutil, json
+from configfactory.utils import dictutil, inotify, iterutil, json
 
 _cached_data = threading.local()
 _cached_data_key = 'settings'
+_cached_generation_key = 'generation'
 
 
 class ConfigStoreSetup(LazyObject):
 
     def _setup(self):
         backend = settings.CONFIGSTORE_BACKEND
-        if backend == 'filesystem':
+        if backend == 'filesystem' and settings.CONFIGSTORE_WATCH:
+            if not inotify.is_supported():
+                raise ImproperlyConfigured('Config store watch requires Linux inotify support.')
+            instance = LiveFileSystemConfigStore(settings.CONFIGSTORE_DIRECTORY)
+        elif backend == 'filesystem':
             instance = FileSystemConfigStore(settings.CONFIGSTORE_DIRECTORY)
         elif backend == 'database':
             instance = DatabaseConfigStore()
@@ -36,16 +45,65 @@ _store: ConfigStore = ConfigStoreSetup()
 #########################################
 @contextlib.contextmanager
 def cached_data():
-    setattr(_cached_data, _cached_data_key, get_all_data())
-    yield
-    delattr(_cached_data, _cached_data_key)
+    if _is_cached():
+        yield
+        return
+    _cached_data.enabled = True
+    try:
+        yield
+    finally:
+        _cached_data.__dict__.clear()
 
 
 def get_all_data() -> Dict[str, Dict[str, dict]]:
     if hasattr(_cached_data, _cached_data_key):
         return getattr(_cached_data, _cached_data_key)
+    if _is_cached():
+        # Pin generation before reading data, so cached data
+        # is never tagged with a newer generation than its own.
+        get_version()
     data = _store.all()
-    return iterutil.traverse(data, lambda value, path: json.loads(value))
+    data = iterutil.traverse(data, lambda value, path: json.loads(value))
+    if _is_cached():
+        setattr(_cached_data, _cached_data_key, data)
+    return data
+
+
+def get_data(environment: str, component: str) -> dict:
+    if hasattr(_cached_data, _cached_data_key):
+        return get_all_data().get(environment, {}).get(component, {})
+    return json.loads(_store.get(environment, component))
+
+
+def get_many_data(pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], dict]:
+    if hasattr(_cached_data, _cached_data_key):
+        all_data = get_all_data()
+        return {
+            (environment, component): all_data[environment][component]
+            for environment, component in pairs
+            if component in all_data.get(environment, {})
+        }
+    return {
+        pair: json.loads(value)
+        for pair, value in _store.get_many(pairs).items()
+    }
+
+
+def get_environment_data(environment: str) -> Dict[str, dict]:
+    if hasattr(_cached_data, _cached_data_key):
+        return get_all_data().get(environment, {})
+    return {
+        component: json.loads(value)
+        for component, value in _store.get_environment(environment).items()
+    }
+
+
+def get_version() -> int:
+    if not _is_cached():
+        return _store.generation()
+    if not hasattr(_cached_data, _cached_generation_key):
+        setattr(_cached_data, _cached_generation_key, _store.generation())
+    return getattr(_cached_data, _cached_generation_key)
 
 
 def update_data(environment: str, component: str, data: dict):
@@ -54,7 +112,40 @@ def update_data(environment: str, component: str, data: dict):
         component=component,
         data=json.dumps(data, compress=True)
     )
+    reset_cached_data()
 
 
 def delete_data(environment: str, component: str):
     _store.delete(environment=environment, component=component)
+    reset_cached_data()
+
+
+def update_many_data(data: Dict[Tuple[str, str], dict]):
+    if not data:
+        return
+    _store.update_many({
+        pair: json.dumps(value, compress=True)
+        for pair, value in data.items()
+    })
+    reset_cached_data()
+
+
+def delete_many_data(pairs: Iterable[Tuple[str, str]]):
+    pairs = list(pairs)
+    if not pairs:
+        return
+    _store.delete_many(pairs)
+    reset_cached_data()
+
+
+def reset_cached_data():
+    for key in (_cached_data_key, _cached_generation_key):
+        if hasattr(_cached_data, key):
+            delattr(_cached_data, key)
+
+
+#########################################
+# Private API
+#########################################
+def _is_cached() -> bool:
+    return getattr(_cached_data, 'enabled', False)
@@ -1,5 +1,5 @@
 import abc
-from typing import Dict
+from typing import Dict, Iterable, Optional, Tuple
 
 
 class ConfigStore(abc.ABC):
@@ -8,6 +8,23 @@ class ConfigStore(abc.ABC):
     def all(self) -> Dict[str, Dict[str, str]]:
         pass
 
+    @abc.abstractmethod
+    def get(self, environment: str, component: str) -> Optional[str]:
+        pass
+
+    @abc.abstractmethod
+    def get_many(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        """
+        Get data of many (environment, component) pairs.
+
+        Missing pairs are omitted from result.
+        """
+        pass
+
+    @abc.abstractmethod
+    def get_environment(self, environment: str) -> Dict[str, str]:
+        pass
+
     @abc.abstractmethod
     def update(self, environment: str, component: str, data: str):
         pass
@@ -15,3 +32,27 @@ class ConfigStore(abc.ABC):
     @abc.abstractmethod
     def delete(self, environment: str, component: str):
         pass
+
+    @abc.abstractmethod
+    def update_many(self, data: Dict[Tuple[str, str], str]):
+        """
+        Update data of many (environment, component) pairs at once.
+        """
+        pass
+
+    @abc.abstractmethod
+    def delete_many(self, pairs: Iterable[Tuple[str, str]]):
+        """
+        Delete data of many (environment, component) pairs at once.
+        """
+        pass
+
+    @abc.abstractmethod
+    def generation(self) -> int:
+        """
+        Get store generation.
+
+        Generation is monotonically increased by every update or delete,
+        so it can be shared between worker processes to detect changes.
+        """
+        pass
@@ -1,12 +1,21 @@
-from typing import Dict
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set, Tuple
 
-from configfactory.models import Config
+from django.db import transaction
+from django.db.models import Q
+
+from configfactory.models import Config, Generation
 
 from .base import ConfigStore
 
 
 class DatabaseConfigStore(ConfigStore):
 
+    generation_name = 'configstore'
+
+    # Keep queries below database bound parameters limits
+    batch_size = 500
+
     def all(self) -> Dict[str, Dict[str, str]]:
         data: Dict[str, Dict[str, str]] = {}
         for config in Config.objects.all():
@@ -15,16 +24,91 @@ class DatabaseConfigStore(ConfigStore):
             data[config.environment][config.component] = config.data
         return data
 
-    def update(self, environment: str, component: str, data: str):
-        config, created = Config.objects.get_or_create(
-            environment=environment,
-            component=component,
+    def get(self, environment: str, component: str) -> Optional[str]:
+        return (
+            Config.objects
+            .filter(environment=environment, component=component)
+            .values_list('data', flat=True)
+            .first()
         )
-        config.data = data
-        config.save(update_fields=['data'])
+
+    def get_many(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+
+        return {
+            (environment, component): data
+            for environment, component, data in (
+                self._filter_many(pairs)
+                .values_list('environment', 'component', 'data')
+            )
+        }
+
+    def get_environment(self, environment: str) -> Dict[str, str]:
+        return dict(
+            Config.objects
+            .filter(environment=environment)
+            .values_list('component', 'data')
+        )
+
+    def update(self, environment: str, component: str, data: str):
+        with transaction.atomic():
+            config, created = Config.objects.get_or_create(
+                environment=environment,
+                component=component,
+            )
+            config.data = data
+            config.save(update_fields=['data'])
+            Generation.objects.increment(self.generation_name)
 
     def delete(self, environment: str, component: str):
-        Config.objects.filter(
-            environment=environment,
-            component=component
-        ).delete()
+        with transaction.atomic():
+            Config.objects.filter(
+                environment=environment,
+                component=component
+            ).delete()
+            Generation.objects.increment(self.generation_name)
+
+    def update_many(self, data: Dict[Tuple[str, str], str]):
+        with transaction.atomic():
+            self._delete_many(data.keys())
+            Config.objects.bulk_create([
+                Config(environment=environment, component=component, data=value)
+                for (environment, component), value in data.items()
+            ])
+            Generation.objects.increment(self.generation_name)
+
+    def delete_many(self, pairs: Iterable[Tuple[str, str]]):
+        with transaction.atomic():
+            self._delete_many(pairs)
+            Generation.objects.increment(self.generation_name)
+
+    def generation(self) -> int:
+        return Generation.objects.value(self.generation_name)
+
+    def _filter_many(self, pairs: Iterable[Tuple[str, str]]):
+
+        components: Dict[str, Set[str]] = defaultdict(set)
+        for environment, component in pairs:
+            components[environment].add(component)
+
+        if not components:
+            return Config.objects.none()
+
+        condition = Q()
+        for environment, aliases in components.items():
+            condition |= Q(environment=environment, component__in=aliases)
+
+        return Config.objects.filter(condition)
+
+    def _delete_many(self, pairs: Iterable[Tuple[str, str]]):
+
+        components: Dict[str, Set[str]] = defaultdict(set)
+        for environment, component in pairs:
+            components[environment].add(component)
+
+        for environment, aliases in components.items():
+            aliases = sorted(aliases)
+            for i in range(0, len(aliases), self.batch_size):
+                Config.objects.filter(
+                    environment=environment,
+                    component__in=aliases[i:i + self.batch_size]
+                ).delete()
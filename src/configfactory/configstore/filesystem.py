@@ -1,39 +1,419 @@
+import contextlib
+import fcntl
 import os
-from typing import Dict
+import threading
+import zlib
+from typing import Dict, Iterable, Optional, Tuple
+
+from configfactory.utils import inotify
 
 from .base import ConfigStore
 
+FileStat = Tuple[int, int, int]
+
 
 class FileSystemConfigStore(ConfigStore):
+    """
+    File system store of `<environment>/<component>.json` files.
+
+    Files created, replaced or removed outside of the store are detected
+    by environment directories mtime. Files written in place are not,
+    unless `.generation` stamp is incremented too or the store is watched
+    (`LiveFileSystemConfigStore`).
+    """
+
+    generation_filename = '.generation'
 
     def __init__(self, directory: str):
         self.directory = directory
+        self.generation_path = os.path.join(self.directory, self.generation_filename)
+        self._files: Dict[str, Tuple[FileStat, str]] = {}
         os.makedirs(self.directory, exist_ok=True)
 
     def all(self) -> Dict[str, Dict[str, str]]:
 
         data: Dict[str, Dict[str, str]] = {}
+        paths = set()
+
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir():
+                continue
+            environment = entry.name
+            data[environment] = {}
+            for component, path in self._component_paths(entry.path):
+                value = self._read(path)
+                if value is not None:
+                    data[environment][component] = value
+                    paths.add(path)
+
+        # Drop deleted files
+        for path in set(self._files) - paths:
+            self._files.pop(path, None)
+
+        return data
+
+    def get(self, environment: str, component: str) -> Optional[str]:
+        return self._read(self._path(environment, component))
 
-        for root, dirs, files in os.walk(self.directory):
-            if root == self.directory:
-                for environment in dirs:
-                    data[environment] = {}
-            else:
-                directory, environment = os.path.split(root)
-                if environment in data and files:
-                    for f in files:
-                        component, extension = os.path.splitext(f)
-                        if extension != '.json':
-                            continue
-                        with open(os.path.join(root, f)) as fp:
-                            data[environment][component] = fp.read()
+    def get_many(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        data: Dict[Tuple[str, str], str] = {}
+        for environment, component in pairs:
+            value = self.get(environment, component)
+            if value is not None:
+                data[(environment, component)] = value
+        return data
+
+    def get_environment(self, environment: str) -> Dict[str, str]:
+        data: Dict[str, str] = {}
+        for component, path in self._component_paths(os.path.join(self.directory, environment)):
+            value = self._read(path)
+            if value is not None:
+                data[component] = value
         return data
 
     def update(self, environment: str, component: str, data: str):
-        os.makedirs(os.path.join(self.directory, environment), exist_ok=True)
-        with open(os.path.join(self.directory, environment, f'{component}.json'), 'w') as fp:
-            fp.write(data)
+        self.update_many({(environment, component): data})
 
     def delete(self, environment: str, component: str):
-        path = os.path.join(self.directory, environment, f'{component}.json')
-        os.remove(path) if os.path.exists(path) else None
+        self.delete_many([(environment, component)])
+
+    def update_many(self, data: Dict[Tuple[str, str], str]):
+        with self._generation_lock():
+            self._write_components(data)
+            self._increment_generation()
+
+    def delete_many(self, pairs: Iterable[Tuple[str, str]]):
+        with self._generation_lock():
+            self._remove_components(pairs)
+            self._increment_generation()
+
+    def generation(self) -> int:
+        return self._check_generation()
+
+    def _check_generation(self, modified: int = 0) -> int:
+        """
+        Get generation stamp, incremented first if store was changed
+        outside of the store since last increment. `modified` is latest
+        mtime of files known to be written since last read.
+        """
+        stamp, fingerprint = self._read_generation()
+        if fingerprint == self._fingerprint() and modified <= self._generation_mtime():
+            return stamp
+        # Writers hold the lock until stamp is incremented,
+        # so their own changes are never counted twice.
+        with self._generation_lock():
+            stamp, fingerprint = self._read_generation()
+            if fingerprint == self._fingerprint() and modified <= self._generation_mtime():
+                return stamp
+            return self._increment_generation()
+
+    def _fingerprint(self) -> int:
+        # Environment directories mtime is changed by files created,
+        # replaced (atomic writes) or removed, not by in-place writes.
+        digest = 0
+        for entry in sorted(os.scandir(self.directory), key=lambda item: item.name):
+            if entry.is_dir():
+                mtime = entry.stat().st_mtime_ns
+                digest = zlib.crc32(f'{entry.name}:{mtime};'.encode(), digest)
+        return digest
+
+    def _read_generation(self) -> Tuple[int, Optional[int]]:
+        """
+        Read generation stamp and store fingerprint of stamp file.
+        """
+        try:
+            with open(self.generation_path) as fp:
+                lines = fp.read().split()
+        except FileNotFoundError:
+            # Empty store
+            return 0, 0
+        try:
+            stamp = int(lines[0]) if lines else 0
+            fingerprint = int(lines[1]) if len(lines) > 1 else None
+        except ValueError:
+            return 0, None
+        return stamp, fingerprint
+
+    def _generation_mtime(self) -> int:
+        try:
+            return os.stat(self.generation_path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def _path(self, environment: str, component: str) -> str:
+        return os.path.join(self.directory, environment, f'{component}.json')
+
+    def _component_paths(self, directory: str) -> Iterable[Tuple[str, str]]:
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            return []
+        paths = []
+        for entry in entries:
+            component, extension = os.path.splitext(entry.name)
+            if extension != '.json' or component.startswith('.'):
+                continue
+            paths.append((component, entry.path))
+        return paths
+
+    def _write_components(self, data: Dict[Tuple[str, str], str]):
+        for (environment, component), value in data.items():
+            os.makedirs(os.path.join(self.directory, environment), exist_ok=True)
+            self._write(self._path(environment, component), value)
+
+    def _remove_components(self, pairs: Iterable[Tuple[str, str]]):
+        for environment, component in pairs:
+            path = self._path(environment, component)
+            os.remove(path) if os.path.exists(path) else None
+            self._files.pop(path, None)
+
+    def _read(self, path: str) -> Optional[str]:
+        """
+        Read file content, reusing cached content of unchanged files.
+        """
+
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._files.pop(path, None)
+            return None
+
+        key = _file_stat(stat)
+
+        try:
+            cached_key, value = self._files[path]
+            if cached_key == key:
+                return value
+        except KeyError:
+            pass
+
+        try:
+            with open(path) as fp:
+                value = fp.read()
+        except FileNotFoundError:
+            self._files.pop(path, None)
+            return None
+
+        self._files[path] = (key, value)
+        return value
+
+    def _write(self, path: str, data: str):
+        """
+        Write file atomically, so readers never see partial content.
+        """
+
+        directory, filename = os.path.split(path)
+        tmp_path = os.path.join(directory, f'.{filename}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            with open(tmp_path, 'w') as fp:
+                fp.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @contextlib.contextmanager
+    def _generation_lock(self):
+        # Concurrent writers never lose an increment, and processes
+        # detecting the same outside change increment it only once.
+        with open(f'{self.generation_path}.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _increment_generation(self) -> int:
+        """
+        Increment generation stamp, must be called with generation lock held.
+        """
+        stamp, _ = self._read_generation()
+        stamp += 1
+        self._write(self.generation_path, f'{stamp}\n{self._fingerprint()}\n')
+        return stamp
+
+
+class LiveFileSystemConfigStore(FileSystemConfigStore):
+    """
+    File system store kept in memory and refreshed by inotify events.
+
+    Watcher thread is started lazily in the process that reads the store,
+    so every forked worker gets its own watcher. Files written in place
+    outside of the store are detected too, when their mtime is newer
+    than `.generation` stamp.
+    """
+
+    dir_mask = inotify.IN_CREATE | inotify.IN_DELETE | inotify.IN_MOVED_FROM | inotify.IN_MOVED_TO | \
+        inotify.IN_CLOSE_WRITE | inotify.IN_DELETE_SELF | inotify.IN_ONLYDIR
+
+    poll_timeout = 1.0
+
+    def __init__(self, directory: str):
+        super().__init__(directory)
+        self._data: Dict[str, Dict[str, str]] = {}
+        self._generation = 0
+        self._lock = threading.RLock()
+        self._pid = None
+        self._stopped = threading.Event()
+        self._inotify: Optional[inotify.Inotify] = None
+        self._watches: Dict[int, Optional[str]] = {}
+
+    def all(self) -> Dict[str, Dict[str, str]]:
+        self._ensure_watching()
+        with self._lock:
+            return {
+                environment: dict(components)
+                for environment, components in self._data.items()
+            }
+
+    def get(self, environment: str, component: str) -> Optional[str]:
+        self._ensure_watching()
+        return self._data.get(environment, {}).get(component)
+
+    def get_many(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        self._ensure_watching()
+        data: Dict[Tuple[str, str], str] = {}
+        for environment, component in pairs:
+            value = self._data.get(environment, {}).get(component)
+            if value is not None:
+                data[(environment, component)] = value
+        return data
+
+    def get_environment(self, environment: str) -> Dict[str, str]:
+        self._ensure_watching()
+        return dict(self._data.get(environment, {}))
+
+    def update_many(self, data: Dict[Tuple[str, str], str]):
+        self._ensure_watching()
+        with self._lock, self._generation_lock():
+            self._write_components(data)
+            for environment, component in data:
+                self._refresh(environment, component)
+            self._generation = self._increment_generation()
+
+    def delete_many(self, pairs: Iterable[Tuple[str, str]]):
+        self._ensure_watching()
+        pairs = list(pairs)
+        with self._lock, self._generation_lock():
+            self._remove_components(pairs)
+            for environment, component in pairs:
+                self._refresh(environment, component)
+            self._generation = self._increment_generation()
+
+    def generation(self) -> int:
+        self._ensure_watching()
+        return self._generation
+
+    def close(self):
+        """
+        Stop watcher thread.
+        """
+        self._stopped.set()
+
+    def _ensure_watching(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._start()
+            self._pid = os.getpid()
+
+    def _start(self):
+
+        self._stopped.clear()
+        self._inotify = inotify.Inotify()
+        self._watches = {}
+
+        # Watch before loading, so no change is missed in between
+        self._watches[self._inotify.add_watch(self.directory, self.dir_mask)] = None
+        for entry in os.scandir(self.directory):
+            if entry.is_dir():
+                self._watch_environment(entry.name)
+
+        self._reload()
+
+        thread = threading.Thread(
+            target=self._run,
+            args=(self._inotify,),
+            name='configstore-watcher',
+            daemon=True
+        )
+        thread.start()
+
+    def _run(self, watcher: 'inotify.Inotify'):
+        try:
+            while not self._stopped.is_set():
+                events = watcher.read(timeout=self.poll_timeout)
+                # Closed store must not write stamp file anymore
+                if events and not self._stopped.is_set():
+                    with self._lock:
+                        modified = max(self._handle(event) for event in events)
+                        self._generation = self._check_generation(modified)
+        finally:
+            watcher.close()
+
+    def _handle(self, event: 'inotify.Event') -> int:
+        """
+        Apply event to loaded data, returning mtime of changed file or 0.
+        """
+
+        if event.mask & inotify.IN_Q_OVERFLOW:
+            self._reload()
+            return 0
+
+        if event.wd not in self._watches:
+            return 0
+
+        environment = self._watches[event.wd]
+
+        if event.mask & inotify.IN_IGNORED:
+            del self._watches[event.wd]
+            return 0
+
+        # Root directory events, generation stamp is read
+        # on generation refresh after every events batch
+        if environment is None:
+            if event.mask & inotify.IN_ISDIR:
+                if event.mask & (inotify.IN_CREATE | inotify.IN_MOVED_TO):
+                    self._watch_environment(event.name)
+                    self._data[event.name] = super().get_environment(event.name)
+                elif event.mask & (inotify.IN_DELETE | inotify.IN_MOVED_FROM):
+                    self._data.pop(event.name, None)
+                    directory = os.path.join(self.directory, event.name, '')
+                    for path in [path for path in self._files if path.startswith(directory)]:
+                        del self._files[path]
+            return 0
+
+        # Environment directory events
+        component, extension = os.path.splitext(event.name)
+        if extension != '.json' or component.startswith('.'):
+            return 0
+
+        return self._refresh(environment, component)
+
+    def _refresh(self, environment: str, component: str) -> int:
+        path = self._path(environment, component)
+        cached = self._files.get(path)
+        value = self._read(path)
+        if value is None:
+            self._data.get(environment, {}).pop(component, None)
+            return 0
+        self._data.setdefault(environment, {})[component] = value
+        # File is read again only if changed since last read
+        if self._files[path] is not cached:
+            return self._files[path][0][0]
+        return 0
+
+    def _watch_environment(self, environment: str):
+        try:
+            wd = self._inotify.add_watch(os.path.join(self.directory, environment), self.dir_mask)
+        except inotify.InotifyError:
+            return
+        self._watches[wd] = environment
+
+    def _reload(self):
+        self._data = super().all()
+        self._generation = self._check_generation()
+
+
+def _file_stat(stat: os.stat_result) -> FileStat:
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Iterable, Optional, Tuple
 
 from .base import ConfigStore
 
@@ -7,17 +7,48 @@ class MemoryConfigStore(ConfigStore):
 
     def __init__(self):
         self._data: Dict[str, Dict[str, str]] = {}
+        self._generation = 0
 
     def all(self) -> Dict[str, Dict[str, str]]:
         return self._data
 
+    def get(self, environment: str, component: str) -> Optional[str]:
+        return self._data.get(environment, {}).get(component)
+
+    def get_many(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        data: Dict[Tuple[str, str], str] = {}
+        for environment, component in pairs:
+            try:
+                data[(environment, component)] = self._data[environment][component]
+            except KeyError:
+                pass
+        return data
+
+    def get_environment(self, environment: str) -> Dict[str, str]:
+        return dict(self._data.get(environment, {}))
+
     def update(self, environment: str, component: str, data: str):
         if environment not in self._data:
             self._data[environment] = {}
         self._data[environment][component] = data
+        self._generation += 1
 
     def delete(self, environment: str, component: str):
         try:
             del self._data[environment][component]
         except KeyError:
             pass
+        self._generation += 1
+
+    def update_many(self, data: Dict[Tuple[str, str], str]):
+        for (environment, component), value in data.items():
+            self._data.setdefault(environment, {})[component] = value
+        self._generation += 1
+
+    def delete_many(self, pairs: Iterable[Tuple[str, str]]):
+        for environment, component in pairs:
+            self._data.get(environment, {}).pop(component, None)
+        self._generation += 1
+
+    def generation(self) -> int:
+        return self._generation
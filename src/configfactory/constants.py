@@ -1,3 +1,9 @@
 LOG_ACTION_TYPE_CREATE = 'create'
 LOG_ACTION_TYPE_UPDATE = 'update'
 LOG_ACTION_TYPE_DELETE = 'delete'
+
+# Taken by settings API routes of environment
+RESERVED_COMPONENT_ALIASES = ('events',)
+
+# Taken by settings API routes
+RESERVED_ENVIRONMENT_ALIASES = ('batch',)
@@ -4,6 +4,7 @@ from django import forms
 from django.core.exceptions import ValidationError
 from django.utils.translation import ugettext_lazy as _
 
+from configfactory.constants import RESERVED_COMPONENT_ALIASES
 from configfactory.exceptions import InvalidSettingsError
 from configfactory.forms.fields import JSONObjectField
 from configfactory.forms.layout import Back
@@ -41,6 +42,16 @@ class ComponentForm(forms.ModelForm):
             )
         )
 
+    def clean_alias(self):
+
+        alias = self.cleaned_data['alias']
+
+        # Existing components keep their aliases
+        if alias in RESERVED_COMPONENT_ALIASES and alias != self.instance.alias:
+            raise ValidationError(_('Alias `%(alias)s` is reserved.') % {'alias': alias})
+
+        return alias
+
 
 class ComponentSchemaForm(forms.Form):
 
@@ -1,9 +1,11 @@
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import ButtonHolder, Field, Layout, Submit
 from django import forms
+from django.core.exceptions import ValidationError
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 
+from configfactory.constants import RESERVED_ENVIRONMENT_ALIASES
 from configfactory.forms.layout import Back
 from configfactory.models import Environment
 
@@ -42,3 +44,13 @@ class EnvironmentForm(forms.ModelForm):
                 Back(reverse('environments'))
             )
         )
+
+    def clean_alias(self):
+
+        alias = self.cleaned_data['alias']
+
+        # Existing environments keep their aliases
+        if alias in RESERVED_ENVIRONMENT_ALIASES and alias != self.instance.alias:
+            raise ValidationError(_('Alias `%(alias)s` is reserved.') % {'alias': alias})
+
+        return alias
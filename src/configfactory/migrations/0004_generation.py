@@ -0,0 +1,25 @@
+# Generated by Django 2.1.5 on 2026-10-18 19:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configfactory', '0003_auto_20181025_0813'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Generation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.SlugField(unique=True, verbose_name='name')),
+                ('value', models.BigIntegerField(default=0, verbose_name='value')),
+            ],
+            options={
+                'verbose_name': 'generation',
+                'verbose_name_plural': 'generations',
+            },
+        ),
+    ]
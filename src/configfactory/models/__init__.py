@@ -3,5 +3,6 @@ from .backup import Backup
 from .component import Component
 from .config import Config
 from .environment import Environment
+from .generation import Generation
 from .log_entry import LogEntry
 from .user import User
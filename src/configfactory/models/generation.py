@@ -0,0 +1,20 @@
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+from configfactory.models.managers import GenerationManager
+
+
+class Generation(models.Model):
+
+    name = models.SlugField(unique=True, verbose_name=_('name'))
+
+    value = models.BigIntegerField(default=0, verbose_name=_('value'))
+
+    objects = GenerationManager()
+
+    class Meta:
+        verbose_name = _('generation')
+        verbose_name_plural = _('generations')
+
+    def __str__(self):
+        return f'{self.name}:{self.value}'
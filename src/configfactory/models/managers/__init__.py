@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 
 from configfactory.shortcuts import get_base_environment
 
@@ -85,3 +85,31 @@ class APISettingsManager(models.Manager):
 
     def active(self):
         return self.get_queryset().enabled()
+
+
+class GenerationQuerySet(models.QuerySet):
+
+    def value(self, name: str) -> int:
+        return self.filter(name=name).values_list('value', flat=True).first() or 0
+
+    def increment(self, name: str):
+        with transaction.atomic(using=self.db):
+            if not self.filter(name=name).update(value=models.F('value') + 1):
+                _, created = self.get_or_create(name=name, defaults={'value': 1})
+                if not created:
+                    self.filter(name=name).update(value=models.F('value') + 1)
+
+
+class GenerationManager(models.Manager):
+
+    def get_queryset(self):
+        return GenerationQuerySet(
+            model=self.model,
+            using=self.db
+        )
+
+    def value(self, name: str) -> int:
+        return self.get_queryset().value(name)
+
+    def increment(self, name: str):
+        return self.get_queryset().increment(name)
@@ -0,0 +1,156 @@
+"""
+In-process registry of environments and components.
+
+Registry is reloaded when environments or components change in this
+process, and when registry version changes in other processes (checked
+at most once per `REGISTRY_CHECK_INTERVAL` seconds). Registered model
+instances are shared, so they must be treated as read-only.
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from configfactory.models import Component, Environment, Generation
+from configfactory.shortcuts import get_base_environment
+
+generation_name = 'registry'
+
+_registry: Optional['Registry'] = None
+_registry_lock = threading.Lock()
+
+
+class Registry:
+
+    def __init__(self, version: int, environments: List[Environment], components: List[Component]):
+        self.version = version
+        self.environments: Dict[str, Environment] = {
+            environment.alias: environment
+            for environment in environments
+        }
+        self.components: Dict[str, Component] = {
+            component.alias: component
+            for component in components
+        }
+        self.layers = _get_layers(environments)
+        self.schemas: Dict[str, Tuple[str, dict]] = {}
+        self.checked_at = time.monotonic()
+
+
+#########################################
+# Public API
+#########################################
+def get_version() -> int:
+    return _get_registry().version
+
+
+def get_environments() -> List[Environment]:
+    return list(_get_registry().environments.values())
+
+
+def get_environment(alias: str) -> Optional[Environment]:
+    return _get_registry().environments.get(alias)
+
+
+def get_components() -> List[Component]:
+    return list(_get_registry().components.values())
+
+
+def get_component(alias: str) -> Optional[Component]:
+    return _get_registry().components.get(alias)
+
+
+def get_component_aliases() -> List[str]:
+    return list(_get_registry().components)
+
+
+def get_component_schema(component: Component) -> dict:
+    registry = _get_registry()
+    schema_json, schema = registry.schemas.get(component.alias, (None, None))
+    if schema_json != component.schema_json:
+        schema = component.schema
+        registry.schemas[component.alias] = (component.schema_json, schema)
+    return schema
+
+
+def get_environment_layers(alias: str) -> Tuple[str, ...]:
+    """
+    Get settings layers of environment fallback chain,
+    ordered from base environment to environment itself.
+    """
+    layers = _get_registry().layers.get(alias)
+    if layers is None:
+        # Not saved environment
+        layers = tuple(dict.fromkeys((get_base_environment(), alias)))
+    return layers
+
+
+def invalidate():
+    """
+    Invalidate registry of all processes.
+    """
+    Generation.objects.increment(generation_name)
+    clear()
+
+
+def clear():
+    """
+    Clear registry of current process.
+    """
+    global _registry
+    with _registry_lock:
+        _registry = None
+
+
+@receiver(setting_changed)
+def clear_registry(setting: str, **kwargs):
+    if setting in ('BASE_ENVIRONMENT', 'REGISTRY_CHECK_INTERVAL'):
+        clear()
+
+
+#########################################
+# Private API
+#########################################
+def _get_registry() -> Registry:
+    global _registry
+    registry = _registry
+    if registry is not None and time.monotonic() - registry.checked_at < settings.REGISTRY_CHECK_INTERVAL:
+        return registry
+    with _registry_lock:
+        if _registry is not None and _registry is not registry:
+            return _registry
+        version = Generation.objects.value(generation_name)
+        if registry is not None and registry.version == version:
+            registry.checked_at = time.monotonic()
+            return registry
+        # Version is read before models, so a concurrent change
+        # is picked up by the next check at the latest.
+        _registry = Registry(
+            version=version,
+            environments=list(Environment.objects.select_related('fallback')),
+            components=list(Component.objects.all()),
+        )
+        return _registry
+
+
+def _get_layers(environments: List[Environment]) -> Dict[str, Tuple[str, ...]]:
+
+    base_alias = get_base_environment()
+    fallbacks = {
+        environment.alias: environment.fallback.alias if environment.fallback_id else None
+        for environment in environments
+    }
+
+    ret = {}
+    for alias in fallbacks:
+        chain = []
+        current = alias
+        while current is not None and current != base_alias and current not in chain:
+            chain.append(current)
+            current = fallbacks.get(current)
+        chain.append(base_alias)
+        ret[alias] = tuple(reversed(chain))
+    return ret
@@ -140,13 +140,11 @@ def load_backup(backup: Backup, user: User = None):
         component.updated_at = item['updated_at']
         component.save()
 
-    for environment, component_data in data.get('configs', {}).items():
-        for component, data in component_data.items():
-            configstore.update_data(
-                environment=environment,
-                component=component,
-                data=data,
-            )
+    configstore.update_many_data({
+        (environment, component): component_settings
+        for environment, components_data in data.get('configs', {}).items()
+        for component, component_settings in components_data.items()
+    })
 
     # Notify about loaded backup
     backup_loaded.send(sender=Backup, backup=backup, user=user)
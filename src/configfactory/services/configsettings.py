@@ -1,4 +1,5 @@
-from typing import Dict, Iterable, Set, Union
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import dictdiffer
 import jsonschema
@@ -6,12 +7,80 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils.translation import ugettext_lazy as _
 
-from configfactory import configstore
+from configfactory import configstore, registry
 from configfactory.exceptions import InvalidSettingsError
 from configfactory.models import Component, Environment
+from configfactory.services.environments import get_environment_layers
+from configfactory.shortcuts import get_base_environment
 from configfactory.utils import dictutil, json, security, tplcontext
 from configfactory.validators import validate_settings_format
 
+_snapshots: Dict[Tuple[str, int], 'SettingsSnapshot'] = {}
+_snapshots_lock = threading.Lock()
+
+
+class InjectKeysIndex:
+    """
+    Injected keys by component, with reverse lookup by referred component.
+    """
+
+    def __init__(self):
+        self.keys: Dict[str, Set[str]] = {}
+        self.referrers: Dict[str, Dict[str, Set[str]]] = {}
+
+    def update(self, component_alias: str, keys: Set[str]):
+        self.remove(component_alias)
+        if not keys:
+            return
+        self.keys[component_alias] = keys
+        for key in keys:
+            referred_alias = key.split('.', 1)[0]
+            self.referrers.setdefault(referred_alias, {}).setdefault(component_alias, set()).add(key)
+
+    def remove(self, component_alias: str):
+        for key in self.keys.pop(component_alias, ()):
+            referred_alias = key.split('.', 1)[0]
+            referrers = self.referrers.get(referred_alias, {})
+            referrers.pop(component_alias, None)
+            if not referrers:
+                self.referrers.pop(referred_alias, None)
+
+    def copy(self) -> 'InjectKeysIndex':
+        index = InjectKeysIndex()
+        index.keys = dict(self.keys)
+        index.referrers = {
+            referred_alias: dict(referrers)
+            for referred_alias, referrers in self.referrers.items()
+        }
+        return index
+
+
+class SettingsSnapshot:
+    """
+    Resolved environment settings for a single store version.
+    """
+
+    def __init__(self, version: int):
+        self.version = version
+        self.components: Dict[str, dict] = {}
+        self.inject_keys: Optional[InjectKeysIndex] = None
+        self.stale_inject_keys: Set[str] = set()
+
+    def evolve(self, version: int, changed_components: Set[str]) -> 'SettingsSnapshot':
+        """
+        Copy snapshot to a newer store version, dropping changed components.
+        """
+        snapshot = SettingsSnapshot(version)
+        snapshot.components = {
+            alias: data
+            for alias, data in self.components.items()
+            if alias not in changed_components
+        }
+        if self.inject_keys is not None:
+            snapshot.inject_keys = self.inject_keys.copy()
+            snapshot.stale_inject_keys = self.stale_inject_keys | changed_components
+        return snapshot
+
 
 def get_all_settings() -> Dict[str, Dict[str, dict]]:
     """
@@ -32,17 +101,58 @@ def get_environment_settings(environment: Environment, components: Iterable[Comp
     """
 
     if components is None:
-        components = Component.objects.all()
+        components = registry.get_components()
 
-    return {
-        component.alias: get_settings(environment, component=component)
-        for component in components
-    }
+    return _get_snapshot_settings(
+        environment=environment,
+        snapshot=get_settings_snapshot(environment),
+        component_aliases=[component.alias for component in components],
+    )
+
+
+def get_environments_settings(
+    environments: Iterable[Environment],
+    components: Iterable[Component] = None
+) -> Dict[str, Dict[str, dict]]:
+    """
+    Get settings of many environments with a single store read.
+    """
+
+    if components is None:
+        components = registry.get_components()
+
+    component_aliases = [component.alias for component in components]
+
+    with configstore.cached_data():
+
+        snapshots = [
+            (environment, get_settings_snapshot(environment))
+            for environment in environments
+        ]
+
+        unresolved = [
+            snapshot for _, snapshot in snapshots
+            if any(alias not in snapshot.components for alias in component_aliases)
+        ]
+        if len(unresolved) > 1:
+            configstore.get_all_data()
+
+        return {
+            environment.alias: _get_snapshot_settings(
+                environment=environment,
+                snapshot=snapshot,
+                component_aliases=component_aliases,
+            )
+            for environment, snapshot in snapshots
+        }
 
 
 def get_settings(environment: Environment, component: Union[Component, str]) -> dict:
     """
     Get component settings.
+
+    Resolved settings are cached per store version and shared between
+    callers, so they must be treated as read-only.
     """
 
     if isinstance(component, Component):
@@ -50,36 +160,47 @@ def get_settings(environment: Environment, component: Union[Component, str]) ->
     else:
         component_alias = component
 
-    all_settings = get_all_settings()
+    snapshot = get_settings_snapshot(environment)
 
-    if environment.is_base:
-        try:
-            return all_settings[environment.alias][component_alias]
-        except KeyError:
-            return {}
+    try:
+        return snapshot.components[component_alias]
+    except KeyError:
+        pass
 
-    else:
+    data = _resolve_settings(environment, [component_alias])[component_alias]
+    snapshot.components[component_alias] = data
+    return data
 
-        base_environment = Environment.objects.base().get()
 
-        try:
-            base_settings = all_settings[base_environment.alias][component_alias]
-        except KeyError:
-            base_settings = {}
+def get_settings_snapshot(environment: Environment) -> SettingsSnapshot:
+    """
+    Get resolved settings snapshot of current store version.
+    """
 
-        try:
-            env_settings = all_settings[environment.alias][component_alias]
-        except KeyError:
-            env_settings = {}
+    version = configstore.get_version()
+    registry_version = registry.get_version()
+    key = (environment.alias, registry_version)
+    snapshot = _snapshots.get(key)
 
-        if environment.fallback:
-            try:
-                fallback_settings = env_settings[environment.fallback.alias][component_alias]
-                env_settings = dictutil.merge(fallback_settings, env_settings)
-            except KeyError:
-                pass
+    if snapshot is None or snapshot.version != version:
+        with _snapshots_lock:
+            snapshot = _snapshots.get(key)
+            if snapshot is None or snapshot.version != version:
+                # Drop snapshots of outdated environments and components
+                for outdated_key in [k for k in _snapshots if k[1] != registry_version]:
+                    del _snapshots[outdated_key]
+                snapshot = SettingsSnapshot(version)
+                _snapshots[key] = snapshot
 
-        return dictutil.merge(base_settings, env_settings)
+    return snapshot
+
+
+def clear_settings_snapshots():
+    """
+    Clear resolved settings snapshots.
+    """
+    with _snapshots_lock:
+        _snapshots.clear()
 
 
 def validate_settings(environment: Environment, component: Component, data: dict):
@@ -94,17 +215,21 @@ def validate_settings(environment: Environment, component: Component, data: dict
         raise InvalidSettingsError(exc.message)
 
     # Validate changed component referred keys
-    setting_keys = list(dictutil.flatten(
+    setting_keys = set(dictutil.flatten(
         {component.alias: data}
     ).keys())
 
-    inject_keys = get_settings_inject_keys(environment, override_settings={
-        component.alias: data
-    })
+    referred_keys = get_settings_referred_keys(environment, component)
+    own_keys = {
+        key for key in _find_inject_keys(data)
+        if key.split('.', 1)[0] == component.alias
+    }
+    if own_keys:
+        referred_keys[component.alias] = own_keys
 
-    for component_alias, keys in inject_keys.items():
-        for key in keys:
-            if key.startswith(component.alias) and key not in setting_keys:
+    for component_alias, keys in referred_keys.items():
+        for key in sorted(keys):
+            if key not in setting_keys:
                 raise InvalidSettingsError(
                     _('Component `%s` refers to changed key `%s`.') % (component_alias, key),
                 )
@@ -118,8 +243,10 @@ def validate_settings(environment: Environment, component: Component, data: dict
         )
     except tplcontext.InvalidKey as exc:
         raise InvalidSettingsError(_('Injected key `%(key)s` does not exist.') % {'key': exc.key})
-    except tplcontext.CircularInjectError:
-        raise InvalidSettingsError(_('Circular key injections detected.'))
+    except tplcontext.CircularInjectError as exc:
+        raise InvalidSettingsError(
+            _('Circular key injections detected: %(cycle)s.') % {'cycle': ' -> '.join(exc.cycle)}
+        )
     except Exception:
         raise InvalidSettingsError(_('Unknown settings validation error.'))
 
@@ -128,7 +255,7 @@ def validate_settings(environment: Environment, component: Component, data: dict
         try:
             jsonschema.validate(
                 instance=data,
-                schema=component.schema
+                schema=registry.get_component_schema(component)
             )
         except (jsonschema.ValidationError, jsonschema.SchemaError) as exc:
             raise InvalidSettingsError(_('Invalid settings schema: %(error)s.') % {'error': exc.message})
@@ -137,7 +264,7 @@ def validate_settings(environment: Environment, component: Component, data: dict
     if component.strict_keys and not environment.is_base:
 
         base_settings = get_settings(
-            environment=Environment.objects.base().get(),
+            environment=registry.get_environment(get_base_environment()),
             component=component,
         )
 
@@ -190,7 +317,9 @@ def update_settings(environment: Environment, component: Component, data: dict,
     if settings.ENCRYPT_ENABLED:
         data = security.encrypt(data, secure_keys=settings.SECURE_KEYS)
 
+    version = configstore.get_version()
     configstore.update_data(environment=environment.alias, component=component.alias, data=data)
+    _evolve_settings_snapshots(version, {component.alias})
 
 
 def inject_settings(
@@ -204,7 +333,7 @@ def inject_settings(
     """
 
     if components is None:
-        components = Component.objects.all()
+        components = registry.get_components()
 
     env_settings = get_environment_settings(environment, components=components)
     context = dictutil.flatten(env_settings)
@@ -220,25 +349,51 @@ def delete_settings(environment: Environment, component: Component):
     """
     Delete settings.
     """
+    version = configstore.get_version()
     configstore.delete_data(
         environment=environment.alias,
         component=component.alias
     )
+    _evolve_settings_snapshots(version, {component.alias})
+
+
+def update_many_settings(items: Iterable[Tuple[Environment, Component, dict]]):
+    """
+    Update many settings at once, without validation.
+    """
+
+    data = {}
+
+    for environment, component, component_settings in items:
+        if settings.ENCRYPT_ENABLED:
+            component_settings = security.encrypt(component_settings, secure_keys=settings.SECURE_KEYS)
+        data[(environment.alias, component.alias)] = component_settings
+
+    version = configstore.get_version()
+    configstore.update_many_data(data)
+    _evolve_settings_snapshots(version, {component_alias for _, component_alias in data})
 
 
 def cleanup_settings():
     """
     Cleanup settings.
     """
+
+    environments = {environment.alias for environment in registry.get_environments()}
+    components = set(registry.get_component_aliases())
+
+    update_data = {}
+    delete_pairs = []
+
     for environment, components_data in configstore.get_all_data().items():
         for component, data in components_data.items():
-            if not Environment.objects.filter(alias=environment).exists():
-                configstore.delete_data(environment=environment, component=component)
+            if environment not in environments or component not in components:
+                delete_pairs.append((environment, component))
                 continue
-            if not Component.objects.filter(alias=component).exists():
-                configstore.delete_data(environment=environment, component=component)
-                continue
-            configstore.update_data(environment=environment, component=component, data=data)
+            update_data[(environment, component)] = data
+
+    configstore.delete_many_data(delete_pairs)
+    configstore.update_many_data(update_data)
 
 
 def get_settings_inject_keys(environment: Environment, override_settings: dict = None) -> Dict[str, Set[str]]:
@@ -246,14 +401,15 @@ def get_settings_inject_keys(environment: Environment, override_settings: dict =
     Get inject keys by component.
     """
 
-    inject_keys = {}
-    env_settings = get_environment_settings(environment)
-    env_settings.update(override_settings or {})
+    inject_keys = dict(_get_inject_keys_index(environment).keys)
 
-    for component_alias, data in env_settings.items():
-        keys = tplcontext.findkeys(json.dumps(data, compress=True))
+    for component_alias, data in (override_settings or {}).items():
+        keys = _find_inject_keys(data)
         if keys:
             inject_keys[component_alias] = keys
+        else:
+            inject_keys.pop(component_alias, None)
+
     return inject_keys
 
 
@@ -262,12 +418,112 @@ def get_settings_referred_keys(environment: Environment, component: Component) -
     Get settings keys referred to current component.
     """
 
-    referred_keys = {}
-    inject_keys = get_settings_inject_keys(environment)
+    referrers = _get_inject_keys_index(environment).referrers.get(component.alias, {})
+
+    return {
+        component_alias: set(keys)
+        for component_alias, keys in referrers.items()
+        if component_alias != component.alias
+    }
+
+
+def _resolve_settings(environment: Environment, component_aliases: List[str]) -> Dict[str, dict]:
+
+    layers = get_environment_layers(environment)
+
+    all_data = configstore.get_many_data(
+        (alias, component_alias)
+        for alias in layers
+        for component_alias in component_aliases
+    )
+
+    if settings.ENCRYPT_ENABLED:
+        all_data = {
+            key: security.decrypt(data=data, secure_keys=settings.SECURE_KEYS)
+            for key, data in all_data.items()
+        }
+
+    return {
+        component_alias: _merge_settings(layers, component_alias, all_data)
+        for component_alias in component_aliases
+    }
+
+
+def _merge_settings(
+    layers: Tuple[str, ...],
+    component_alias: str,
+    all_data: Dict[Tuple[str, str], dict]
+) -> dict:
+
+    # Unmerged subtrees are shared with store data, not copied
+    return dictutil.materialize(dictutil.LayeredDict(*(
+        all_data.get((alias, component_alias), {})
+        for alias in layers
+    )))
+
+
+def _get_snapshot_settings(
+    environment: Environment,
+    snapshot: SettingsSnapshot,
+    component_aliases: List[str]
+) -> Dict[str, dict]:
+
+    missing = [alias for alias in component_aliases if alias not in snapshot.components]
+    if missing:
+        snapshot.components.update(_resolve_settings(environment, missing))
+
+    return {
+        alias: snapshot.components[alias]
+        for alias in component_aliases
+    }
+
+
+def _get_inject_keys_index(environment: Environment) -> InjectKeysIndex:
+
+    snapshot = get_settings_snapshot(environment)
+
+    if snapshot.inject_keys is None:
+        index = InjectKeysIndex()
+        env_settings = _get_snapshot_settings(
+            environment=environment,
+            snapshot=snapshot,
+            component_aliases=registry.get_component_aliases(),
+        )
+        for component_alias, data in env_settings.items():
+            index.update(component_alias, _find_inject_keys(data))
+        snapshot.inject_keys = index
+        snapshot.stale_inject_keys = set()
+
+    # Reindex components changed since previous store version
+    while snapshot.stale_inject_keys:
+        try:
+            component_alias = snapshot.stale_inject_keys.pop()
+        except KeyError:
+            break
+        data = _get_snapshot_settings(environment, snapshot, [component_alias])[component_alias]
+        snapshot.inject_keys.update(component_alias, _find_inject_keys(data))
+
+    return snapshot.inject_keys
+
+
+def _find_inject_keys(data: dict) -> Set[str]:
+    return tplcontext.findkeys(json.dumps(data, compress=True))
+
+
+def _evolve_settings_snapshots(version: int, changed_components: Set[str]):
+    """
+    Carry snapshots over a local store write.
+
+    Snapshots are only carried when no other process changed the store
+    in between, otherwise they expire with their version.
+    """
+
+    new_version = configstore.get_version()
 
-    for component_alias, keys in inject_keys.items():
-        if component.alias == component_alias:
-            continue
-        referred_keys[component_alias] = {key for key in keys if key.startswith(component.alias)}
+    if new_version != version + 1:
+        return
 
-    return referred_keys
+    with _snapshots_lock:
+        for key, snapshot in list(_snapshots.items()):
+            if snapshot.version == version:
+                _snapshots[key] = snapshot.evolve(new_version, changed_components)
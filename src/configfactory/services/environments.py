@@ -1,8 +1,9 @@
-from typing import Iterable, Union
+from typing import Iterable, Tuple, Union
 
 from django.contrib.auth.models import Group
 from guardian.shortcuts import get_objects_for_group, get_objects_for_user
 
+from configfactory import registry
 from configfactory.models import Environment, User
 
 
@@ -48,3 +49,11 @@ def get_user_or_group_view_environments(user_or_group: Union[User, Group]):
         any_perm=True,
         klass=environments
     )
+
+
+def get_environment_layers(environment: Environment) -> Tuple[str, ...]:
+    """
+    Get settings layers of environment fallback chain,
+    ordered from base environment to environment itself.
+    """
+    return registry.get_environment_layers(environment.alias)
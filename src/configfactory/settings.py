@@ -258,6 +258,11 @@ ENCRYPT_TOKEN = config.get('encrypt.token', default=SECRET_KEY)
 
 ENCRYPT_PREFIX = '$$$ENCRYPTED$$$:'
 
+# Decrypted values cache, keyed by ciphertext
+ENCRYPT_CACHE_SIZE = config.getint('encrypt.cache_size', default=4096)
+
+ENCRYPT_CACHE_TTL = config.getint('encrypt.cache_ttl', default=300)  # 5 minutes
+
 # Check encrypt key length
 if ENCRYPT_ENABLED:
     if not ENCRYPT_TOKEN or len(ENCRYPT_TOKEN) < 32:
@@ -266,11 +271,36 @@ if ENCRYPT_ENABLED:
 # Secured keys
 SECURE_KEYS = config.getlist('secure_keys', default=['pass', 'password'])
 
+# Environments and components registry version check interval (seconds)
+REGISTRY_CHECK_INTERVAL = config.getint('registry.check_interval', default=5)
+
+# JSON codec backend (json, orjson)
+JSON_BACKEND = config.get('json.backend', default='json')
+
 # ConfigStore settings
 CONFIGSTORE_BACKEND = config.get('configstore.backend', default='database')
 
 CONFIGSTORE_DIRECTORY = config.get('configstore.filesystem.directory', default=paths.var_path('data/configstore'))
 
+CONFIGSTORE_WATCH = config.getbool('configstore.filesystem.watch', default=False)
+
+# API settings
+API_WAIT_TIMEOUT = config.getint('api.wait_timeout', default=60)  # 1 minute
+
+API_WAIT_INTERVAL = 0.5
+
+API_EVENTS_TIMEOUT = config.getint('api.events_timeout', default=300)  # 5 minutes
+
+API_EVENTS_HEARTBEAT = 15
+
+# Token credentials cache, keyed by token
+API_TOKEN_CACHE_SIZE = config.getint('api.token_cache_size', default=1024)
+
+API_TOKEN_CACHE_TTL = config.getint('api.token_cache_ttl', default=30)  # 30 seconds
+
+# Rendered and compressed settings payloads cache
+API_PAYLOAD_CACHE_SIZE = config.getint('api.payload_cache_size', default=256)
+
 # Backups settings
 BACKUPS_INTERVAL = config.getint('backup.interval', default=7200)  # Every 2 hours
 
@@ -3,13 +3,24 @@ import copy
 import dictdiffer
 from django.contrib.auth.models import Group
 from django.contrib.auth.signals import user_logged_in, user_logged_out
-from django.db.models.signals import pre_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
 from django.dispatch import receiver
+from guardian.models import GroupObjectPermission, UserObjectPermission
 
+from configfactory import registry
+from configfactory.api.authentication import clear_credentials_cache
 from configfactory.models import Backup, Component, Environment, User
 from configfactory.models.api_settings import APISettings
 from configfactory.services.apisettings import generate_api_token
-from configfactory.services.configsettings import get_settings, update_settings
+from configfactory.services.configsettings import (
+    get_settings,
+    update_many_settings,
+)
 from configfactory.services.logs import (
     log_action,
     log_create_object,
@@ -85,6 +96,25 @@ def set_api_token(instance: APISettings, **kwargs):
         instance.token = generate_api_token()
 
 
+@receiver(post_save, sender=APISettings)
+@receiver(post_delete, sender=APISettings)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Environment)
+@receiver(post_delete, sender=Environment)
+@receiver(post_save, sender=UserObjectPermission)
+@receiver(post_delete, sender=UserObjectPermission)
+@receiver(post_save, sender=GroupObjectPermission)
+@receiver(post_delete, sender=GroupObjectPermission)
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def api_credentials_handler(sender, **kwargs):
+
+    clear_credentials_cache()
+
+
 @receiver(user_created, sender=User)
 def user_created_handler(sender, user, **kwargs):
 
@@ -123,6 +153,15 @@ def environment_pre_save_handler(sender, instance, **kwargs):
             instance.order = environment.order + 1
 
 
+@receiver(post_save, sender=Environment)
+@receiver(post_delete, sender=Environment)
+@receiver(post_save, sender=Component)
+@receiver(post_delete, sender=Component)
+def registry_handler(sender, **kwargs):
+
+    registry.invalidate()
+
+
 @receiver(environment_created, sender=Environment)
 def environment_created_handler(sender, environment, **kwargs):
 
@@ -187,19 +226,13 @@ def component_updated_handler(sender, component, old_data, **kwargs):
 @receiver(component_alias_changed, sender=Component)
 def component_alias_changed_handler(sender, component: Component, old_alias: str, **kwargs):
 
-    for environment in Environment.objects.all():
-
-        data_copy = copy.deepcopy(get_settings(
+    update_many_settings(
+        (environment, component, copy.deepcopy(get_settings(
             environment=environment,
             component=old_alias,
-        ))
-
-        update_settings(
-            environment=environment,
-            component=component,
-            data=data_copy,
-            validate=False
-        )
+        )))
+        for environment in Environment.objects.all()
+    )
 
 
 @receiver(settings_updated, sender=Component)
@@ -38,6 +38,12 @@ LOGGING = None
 ######################################
 ENCRYPT_ENABLED = False
 
+###########################################
+# Registry settings
+###########################################
+# Single process, avoid version checks in query counting tests
+REGISTRY_CHECK_INTERVAL = 3600
+
 ###########################################
 # Config store settings
 ###########################################
@@ -1,4 +1,6 @@
 import copy
+from collections.abc import Mapping
+from typing import Any, Iterator
 
 
 def merge(d1: dict, d2: dict) -> dict:
@@ -26,3 +28,68 @@ def flatten(d: dict, parent: str = '', sep: str = '.') -> dict:
         else:
             ret[new_key] = value
     return ret
+
+
+class LayeredDict(Mapping):
+    """
+    Read-only view of dictionaries layered from bottom to top.
+
+    Upper layer values override lower ones, nested dictionaries
+    are layered recursively without copying.
+    """
+
+    __slots__ = ('layers',)
+
+    def __init__(self, *layers: Mapping):
+        self.layers = [layer for layer in layers if layer]
+
+    def __getitem__(self, key: str) -> Any:
+        mappings = []
+        for layer in reversed(self.layers):
+            if key not in layer:
+                continue
+            value = layer[key]
+            if not isinstance(value, Mapping):
+                if mappings:
+                    break
+                return value
+            mappings.append(value)
+        if not mappings:
+            raise KeyError(key)
+        if len(mappings) == 1:
+            return mappings[0]
+        return LayeredDict(*reversed(mappings))
+
+    def __contains__(self, key: Any) -> bool:
+        return any(key in layer for layer in self.layers)
+
+    def __iter__(self) -> Iterator[str]:
+        if len(self.layers) == 1:
+            yield from self.layers[0]
+            return
+        seen = set()
+        for layer in self.layers:
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.layers!r})'
+
+
+def materialize(d: Mapping) -> dict:
+    """
+    Materialize layered dictionary, subtrees of single layer are shared.
+    """
+    if not isinstance(d, LayeredDict):
+        return d
+    if len(d.layers) == 1:
+        return materialize(d.layers[0])
+    return {
+        key: materialize(value)
+        for key, value in d.items()
+    }
@@ -0,0 +1,109 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+from typing import List, NamedTuple, Optional
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+_libc = None
+
+
+class InotifyError(OSError):
+    pass
+
+
+class Event(NamedTuple):
+    wd: int
+    mask: int
+    cookie: int
+    name: str
+
+
+def is_supported() -> bool:
+    """
+    Check whether inotify is available on current platform.
+    """
+    try:
+        _get_libc()
+    except InotifyError:
+        return False
+    return True
+
+
+class Inotify:
+    """
+    Minimal Linux inotify binding.
+    """
+
+    def __init__(self):
+        libc = _get_libc()
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise InotifyError(errno, os.strerror(errno))
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise InotifyError(errno, os.strerror(errno), path)
+        return wd
+
+    def read(self, timeout: Optional[float] = None) -> List[Event]:
+        """
+        Read pending events, waiting at most `timeout` seconds.
+        """
+
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            events.append(Event(wd, mask, cookie, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def _get_libc():
+    global _libc
+    if _libc is None:
+        name = ctypes.util.find_library('c')
+        try:
+            libc = ctypes.CDLL(name, use_errno=True)
+            libc.inotify_init1
+            libc.inotify_add_watch
+        except (OSError, AttributeError) as exc:
+            raise InotifyError(f'inotify is not supported: {exc}.')
+        _libc = libc
+    return _libc
@@ -1,25 +1,82 @@
-from typing import Callable, List, Union, Any
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
 
 Iter = Union[list, dict, Any]
 IterPath = List[Union[int, str]]
 
 
-def traverse(obj: Iter, callback: Callable[[Iter, IterPath], Iter], path: IterPath = None) -> Iter:
+class _Frame:
+
+    __slots__ = ('obj', 'items', 'result')
+
+    def __init__(self, obj: Union[list, dict]):
+        self.obj = obj
+        self.items: Iterator[Tuple[Union[int, str], Any]] = (
+            iter(obj.items()) if isinstance(obj, dict) else enumerate(obj)
+        )
+        self.result: Optional[Union[list, dict]] = None
+
+
+def traverse(
+    obj: Iter,
+    callback: Callable[[Iter, IterPath], Iter],
+    path: IterPath = None,
+    copy_on_change: bool = False,
+    prune: Callable[[IterPath], bool] = None,
+) -> Iter:
     """
     Traverse through nested dict or list.
+
+    Callback path is shared between calls and must be copied to be kept.
+    With `copy_on_change`, containers without changed values are
+    returned as is. Subtrees of paths matched by `prune` are returned
+    as is, without callback calls.
     """
 
-    path = path or []
+    path = list(path) if path else []
+
+    if prune is not None and prune(path):
+        return obj
+
+    if not isinstance(obj, (dict, list)):
+        return callback(obj, path)
+
+    stack = [_Frame(obj)]
+
+    while True:
+
+        frame = stack[-1]
+
+        for key, value in frame.items:
+            path.append(key)
+            if prune is not None and prune(path):
+                new_value = value
+            elif isinstance(value, (dict, list)):
+                # Descend, path is popped when subtree is done
+                stack.append(_Frame(value))
+                break
+            else:
+                new_value = callback(value, path)
+            path.pop()
+            _set(frame, key, value, new_value, copy_on_change)
+        else:
+            stack.pop()
+            if frame.result is not None:
+                result = frame.result
+            elif copy_on_change:
+                result = frame.obj
+            else:
+                result = {} if isinstance(frame.obj, dict) else []
+            if not stack:
+                return result
+            key = path.pop()
+            parent = stack[-1]
+            _set(parent, key, frame.obj, result, copy_on_change)
 
-    if isinstance(obj, dict):
-        return {
-            key: traverse(value, callback, path + [key])
-            for key, value in obj.items()
-        }
-    elif isinstance(obj, list):
-        return [
-            traverse(elem, callback, path + [index])
-            for index, elem in enumerate(obj)
-        ]
 
-    return callback(obj, path)
+def _set(frame: _Frame, key: Union[int, str], value: Any, new_value: Any, copy_on_change: bool):
+    if frame.result is None:
+        if copy_on_change and new_value is value:
+            return
+        # Copy lazily, so unchanged containers are never rebuilt
+        frame.result = dict(frame.obj) if isinstance(frame.obj, dict) else list(frame.obj)
+    frame.result[key] = new_value
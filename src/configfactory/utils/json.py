@@ -1,6 +1,29 @@
 import json
+import math
+import re
+from typing import Optional
 
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Floats formatted by orjson unlike stdlib `repr`, e.g. `1e16` or `0.00001`
+_ORJSON_FLOAT_RE = re.compile(rb'[0-9][eE]|0\.0000')
+
+# Integers out of 64-bit range are loaded as floats by orjson
+_ORJSON_BIG_INT_RE = re.compile(r'[0-9]{19}')
+_ORJSON_BIG_INT_BYTES_RE = re.compile(rb'[0-9]{19}')
+
+_encoder = DjangoJSONEncoder()
+
+_backend = None
 
 
 class JSONLoadError(Exception):
@@ -8,6 +31,10 @@ class JSONLoadError(Exception):
 
 
 def dumps(obj, indent=None, compress=False):
+    if compress and indent is None and _get_backend() == 'orjson':
+        ret = _orjson_dumps(obj)
+        if ret is not None:
+            return ret
     separators = None
     if compress:
         separators = (',', ':')
@@ -22,7 +49,70 @@ def dumps(obj, indent=None, compress=False):
 def loads(s: str):
     if not s:
         return {}
+    if _get_backend() == 'orjson' and not _has_big_int(s):
+        try:
+            return orjson.loads(s)
+        except Exception:
+            # Stdlib is more permissive (NaN, big integers, surrogates)
+            pass
     try:
         return json.loads(s)
     except Exception as exc:
         raise JSONLoadError(f'Invalid JSON: {exc}.')
+
+
+@receiver(setting_changed)
+def reset_backend(setting: str, **kwargs):
+    global _backend
+    if setting == 'JSON_BACKEND':
+        _backend = None
+
+
+def _get_backend() -> str:
+    global _backend
+    if _backend is None:
+        backend = settings.JSON_BACKEND
+        if backend not in ('json', 'orjson'):
+            raise ImproperlyConfigured(f'Unknown JSON backend `{backend}`.')
+        if backend == 'orjson' and orjson is None:
+            raise ImproperlyConfigured('JSON backend `orjson` requires orjson package.')
+        _backend = backend
+    return _backend
+
+
+def _orjson_dumps(obj) -> Optional[str]:
+    """
+    Dump compressed JSON with orjson, or return None
+    when output may differ from stdlib `json.dumps`.
+    """
+    try:
+        ret = orjson.dumps(
+            obj,
+            default=_encoder.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+        )
+    except TypeError:
+        # Non string keys, big integers or unsupported types
+        return None
+    # Stdlib escapes non-ASCII and DEL characters, orjson does not
+    if not ret.isascii() or b'\x7f' in ret or _ORJSON_FLOAT_RE.search(ret):
+        return None
+    if b'null' in ret and _has_nonfinite_float(obj):
+        return None
+    return ret.decode()
+
+
+def _has_big_int(s) -> bool:
+    if isinstance(s, bytes):
+        return _ORJSON_BIG_INT_BYTES_RE.search(s) is not None
+    return _ORJSON_BIG_INT_RE.search(s) is not None
+
+
+def _has_nonfinite_float(obj) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_nonfinite_float(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_nonfinite_float(value) for value in obj)
+    return False
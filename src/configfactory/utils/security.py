@@ -1,13 +1,18 @@
 import abc
 import base64
 import re
-from typing import Any, List
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from cryptography.fernet import Fernet
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.functional import cached_property
 
 from configfactory.utils import iterutil, json
+from configfactory.utils.cache import LRUCache
 
 
 class Encryptor(abc.ABC):
@@ -50,23 +55,68 @@ class DummyDataEncryptor(Encryptor):
 
 
 class DataEncryptor:
+    """
+    Settings based data encryptor.
+
+    Encryptor instance is reused while encrypt settings stay the same,
+    and decrypted values are kept in a bounded cache keyed by ciphertext.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._settings_key = None
+        self._encryptor_instance: Encryptor = DummyDataEncryptor()
+        self._cache = LRUCache(maxsize=0)
 
     @property
     def _encryptor(self) -> Encryptor:
-        if not settings.ENCRYPT_ENABLED:
-            return DummyDataEncryptor()
-        else:
-            return FernetDataEncryptor(settings.ENCRYPT_TOKEN)
+        settings_key = (settings.ENCRYPT_ENABLED, settings.ENCRYPT_TOKEN)
+        if settings_key != self._settings_key:
+            with self._lock:
+                if settings_key != self._settings_key:
+                    if not settings.ENCRYPT_ENABLED:
+                        self._encryptor_instance = DummyDataEncryptor()
+                    else:
+                        self._encryptor_instance = FernetDataEncryptor(settings.ENCRYPT_TOKEN)
+                    self._cache = LRUCache(
+                        maxsize=settings.ENCRYPT_CACHE_SIZE,
+                        ttl=settings.ENCRYPT_CACHE_TTL,
+                    )
+                    self._settings_key = settings_key
+        return self._encryptor_instance
 
     def encrypt(self, data: str) -> str:
         return self._encryptor.encrypt(data.encode()).decode()
 
     def decrypt(self, data: str) -> str:
-        return self._encryptor.decrypt(data.encode()).decode()
+        encryptor = self._encryptor
+        if isinstance(encryptor, DummyDataEncryptor):
+            return data
+        cache = self._cache
+        value = cache.get(data)
+        if value is None:
+            value = encryptor.decrypt(data.encode()).decode()
+            cache.set(data, value)
+        return value
+
+    def clear(self):
+        """
+        Drop encryptor and decrypted values, e.g. on key rotation.
+        """
+        with self._lock:
+            self._settings_key = None
+            self._cache.clear()
 
 
 encryptor = DataEncryptor()
 
+
+@receiver(setting_changed)
+def clear_encryptor(setting: str, **kwargs):
+    if setting.startswith('ENCRYPT_'):
+        encryptor.clear()
+
+
 # Public API helpers
 encrypt_data = encryptor.encrypt
 decrypt_data = encryptor.decrypt
@@ -81,39 +131,35 @@ def encrypt(data: dict, secure_keys: List[str]) -> dict:
     if not secure_keys:
         return data
 
-    hidden_re = re.compile('|'.join(secure_keys), flags=re.IGNORECASE)
+    policy = get_secure_key_policy(secure_keys)
 
     def _process(value: Any, path: iterutil.IterPath) -> str:
 
-        if not is_encrypted(value):
-            path = _str_path(path)
-            if hidden_re.search(path):
-                encrypted_data = encrypt_data(json.dumps({
-                    'value': value
-                }))
-                return f'{settings.ENCRYPT_PREFIX}{encrypted_data}'
+        if not is_encrypted(value) and policy.matches(path):
+            encrypted_data = encrypt_data(json.dumps({
+                'value': value
+            }))
+            return f'{settings.ENCRYPT_PREFIX}{encrypted_data}'
 
         return value
 
-    return iterutil.traverse(data, _process)
+    return iterutil.traverse(data, _process, copy_on_change=True, prune=policy.prune)
 
 
 def decrypt(data: dict, secure_keys: List[str]) -> dict:
 
-    hidden_re = re.compile('|'.join(secure_keys), flags=re.IGNORECASE)
+    policy = get_secure_key_policy(secure_keys)
 
     def _process(value: Any, path: iterutil.IterPath) -> Any:
 
-        if is_encrypted(value):
-            path = _str_path(path)
-            if hidden_re.search(path):
-                encrypted_data = value.split(settings.ENCRYPT_PREFIX, maxsplit=1)[-1]
-                obj = decrypt_data(encrypted_data)
-                return json.loads(obj)['value']
+        if is_encrypted(value) and policy.matches(path):
+            encrypted_data = value.split(settings.ENCRYPT_PREFIX, maxsplit=1)[-1]
+            obj = decrypt_data(encrypted_data)
+            return json.loads(obj)['value']
 
         return value
 
-    return iterutil.traverse(data, _process)
+    return iterutil.traverse(data, _process, copy_on_change=True, prune=policy.prune)
 
 
 def cleanse(data: dict, hidden='password', substitute='*****'):
@@ -121,15 +167,141 @@ def cleanse(data: dict, hidden='password', substitute='*****'):
     if isinstance(hidden, str):
         hidden = hidden.split()
 
-    hidden_re = re.compile('|'.join(hidden), flags=re.IGNORECASE)
+    policy = get_secure_key_policy(hidden)
 
     def _replace(value, path: iterutil.IterPath):
-        path = _str_path(path)
-        if hidden_re.search(path):
+        if policy.matches(path):
             return substitute
         return value
 
-    return iterutil.traverse(data, _replace)
+    return iterutil.traverse(data, _replace, prune=policy.prune)
+
+
+class SecureKeyPolicy:
+    """
+    Compiled secure keys matcher of settings key paths.
+
+    Key path is matched as dot joined string keys, decisions are
+    cached per path. Subtrees are classified as matching for all
+    descendants (ALL), for none of them (NONE) or for some (SOME).
+    NONE is only known for patterns anchored with `^` to literal keys.
+    """
+
+    ALL = 'all'
+    NONE = 'none'
+    SOME = 'some'
+
+    cache_size = 4096
+
+    def __init__(self, secure_keys: Iterable[str]):
+        secure_keys = list(secure_keys)
+        self._re = re.compile('|'.join(secure_keys), flags=re.IGNORECASE)
+        # Match of a path holds for its descendants, unless
+        # pattern looks past the end of matched path
+        self._prefix_closed = not any(
+            token in key
+            for key in secure_keys
+            for token in ('$', '\\Z', '\\B', '(?=', '(?!')
+        )
+        literals = [_anchored_literal(key) for key in secure_keys]
+        self._literals = None if not literals or None in literals else literals
+        self._matches: Dict[str, bool] = {}
+        self._subtrees: Dict[str, str] = {}
+
+    @property
+    def prune(self) -> Optional[Callable[[iterutil.IterPath], bool]]:
+        """
+        Traverse prune predicate, if subtrees can be excluded at all.
+        """
+        if self._literals is None:
+            return None
+        return self.excludes
+
+    def matches(self, path: iterutil.IterPath) -> bool:
+        """
+        Check whether key path is secure.
+        """
+        key = _str_path(path)
+        try:
+            return self._matches[key]
+        except KeyError:
+            pass
+        ret = self._re.search(key) is not None
+        _cache_set(self._matches, key, ret, self.cache_size)
+        return ret
+
+    def subtree(self, path: iterutil.IterPath) -> str:
+        """
+        Classify secure keys of key path descendants.
+        """
+        key = _str_path(path)
+        try:
+            return self._subtrees[key]
+        except KeyError:
+            pass
+        if self._prefix_closed and self.matches(path):
+            ret = self.ALL
+        elif key and self._literals is not None and not any(
+            _literal_possible(key, literal)
+            for literal in self._literals
+        ):
+            ret = self.NONE
+        else:
+            ret = self.SOME
+        _cache_set(self._subtrees, key, ret, self.cache_size)
+        return ret
+
+    def excludes(self, path: iterutil.IterPath) -> bool:
+        """
+        Check whether no descendant of key path can be secure.
+        """
+        return self.subtree(path) == self.NONE
+
+
+@lru_cache(maxsize=32)
+def _get_secure_key_policy(secure_keys: Tuple[str, ...]) -> SecureKeyPolicy:
+    return SecureKeyPolicy(secure_keys)
+
+
+def get_secure_key_policy(secure_keys: Iterable[str]) -> SecureKeyPolicy:
+    """
+    Get compiled secure keys policy, shared per secure keys.
+    """
+    return _get_secure_key_policy(tuple(secure_keys))
+
+
+def _anchored_literal(pattern: str) -> Optional[str]:
+    if not pattern.startswith('^'):
+        return None
+    chars = []
+    escaped = False
+    for char in pattern[1:]:
+        if escaped:
+            if char.isalnum():
+                return None
+            chars.append(char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char in '.^$*+?{}[]|()':
+            return None
+        else:
+            chars.append(char)
+    if escaped:
+        return None
+    return ''.join(chars).lower()
+
+
+def _literal_possible(key: str, literal: str) -> bool:
+    # Descendant paths are `key`, or `key.` followed by any keys
+    key = key.lower()
+    return key.startswith(literal) or f'{key}.'.startswith(literal) or literal.startswith(f'{key}.')
+
+
+def _cache_set(cache: dict, key: str, value: Any, maxsize: int):
+    if len(cache) >= maxsize:
+        cache.clear()
+    cache[key] = value
 
 
 def _str_path(path: iterutil.IterPath) -> str:
@@ -1,5 +1,6 @@
+import functools
 import re
-from typing import Any, Dict, Union, Set
+from typing import Any, Dict, List, Set, Tuple, Union
 
 from django.utils.translation import ugettext_lazy as _
 
@@ -7,13 +8,18 @@ from configfactory.utils import iterutil
 
 KEY_PATTERN = r'[a-zA-Z][(\-|\.)a-zA-Z0-9_]*'
 KEY_RE = re.compile(r'(?<!\$)(\$(?:{(%(n)s)}))' % ({'n': KEY_PATTERN}))
-CIRCULAR_THRESHOLD = 50
 
 Template = Union[list, dict, str, Any]
 
 
 class CircularInjectError(Exception):
-    pass
+
+    def __init__(self, message: str, cycle: List[str] = None):
+        self.message = message
+        self.cycle = cycle or []
+
+    def __str__(self):
+        return str(self.message)
 
 
 class InvalidKey(Exception):
@@ -26,61 +32,127 @@ class InvalidKey(Exception):
         return self.message
 
 
-def inject(template: Template, context: Dict[str, Any], strict: bool = True, calls: int = 0) -> Template:
+class Injector:
     """
-    Inject context to template.
+    Compiled injection context.
+
+    Every context value is parsed once and referenced keys are resolved
+    in dependency order, so each key is injected only once.
     """
 
-    # Traverse template values
-    if isinstance(template, (list, dict)):
-        return iterutil.traverse(template, lambda v, k: inject(
-            template=v,
-            context=context,
-            strict=strict
-        ))
+    def __init__(self, context: Dict[str, Any], strict: bool = True):
+        self.context = context
+        self.strict = strict
+        self._graph: Dict[str, Set[str]] = {}
+        self._resolved: Dict[str, Any] = {}
+        self._unresolvable: Set[str] = set()
 
-    # Return other types
-    if not isinstance(template, str):
-        return template
+    def inject(self, template: Template) -> Template:
+        """
+        Inject context to template.
+        """
 
-    result = KEY_RE.findall(template)
+        if isinstance(template, (list, dict)):
+            return iterutil.traverse(template, lambda v, p: self.inject(v), copy_on_change=True)
 
-    # Increment recursive calls
-    calls += 1
+        if not isinstance(template, str):
+            return template
 
-    # Skip parameters replace
-    if not result:
-        return template
+        refs = _findall(template)
+
+        if not refs:
+            return template
+
+        for whole, key in refs:
+            self.resolve(key)
+
+        # Keep referred value type
+        if len(refs) == 1 and refs[0][0] == template:
+            key = refs[0][1]
+            if key in self._resolved:
+                return self._resolved[key]
+            return template
+
+        for whole, key in refs:
+            if key in self._resolved:
+                template = template.replace(whole, str(self._resolved[key]))
 
-    # Check circular injections
-    if calls > CIRCULAR_THRESHOLD:
-        if strict:
-            raise CircularInjectError(_('Circular injections detected.'))
         return template
 
-    # Replace template context
-    for whole, key in result:
+    def resolve(self, key: str) -> Any:
+        """
+        Resolve context key with all its dependencies.
+        """
+
+        if key in self._resolved:
+            return self._resolved[key]
+
+        # Circular or missing dependencies are left not injected
+        if key in self._unresolvable:
+            return None
+
+        if key not in self.context:
+            return self._missing(key)
+
+        # Iterative depth-first search, resolving keys in post-order
+        path: List[str] = [key]
+        stack = [(key, iter(self.dependencies(key)))]
+
+        while stack:
+            current, dependencies = stack[-1]
+            for dependency in dependencies:
+                if dependency in self._resolved or dependency in self._unresolvable:
+                    continue
+                if dependency not in self.context:
+                    self._missing(dependency)
+                    continue
+                if dependency in path:
+                    cycle = path[path.index(dependency):] + [dependency]
+                    if self.strict:
+                        raise CircularInjectError(_('Circular injections detected.'), cycle=cycle)
+                    self._unresolvable.add(dependency)
+                    continue
+                path.append(dependency)
+                stack.append((dependency, iter(self.dependencies(dependency))))
+                break
+            else:
+                stack.pop()
+                path.pop()
+                if current not in self._unresolvable:
+                    self._resolved[current] = self.inject(self.context[current])
+
+        return self._resolved.get(key)
+
+    def dependencies(self, key: str) -> Set[str]:
+        """
+        Get keys referred by context key value.
+        """
         try:
-            value = inject(
-                template=context[key],
-                context=context,
-                calls=calls,
-                strict=strict
-            )
-            str_value = str(value)
-            template = template.replace(whole, str_value)
-            if str_value == template:
-                return value
+            return self._graph[key]
         except KeyError:
-            if strict:
-                raise InvalidKey(_('Injected key `%(key)s` does not exist.') % {'key': key}, key=key)
+            pass
+        keys = set()
+
+        def _collect(value: Any, path: iterutil.IterPath) -> Any:
+            if isinstance(value, str):
+                keys.update(ref[1] for ref in _findall(value))
+            return value
+
+        iterutil.traverse(self.context[key], _collect, copy_on_change=True)
+        self._graph[key] = keys
+        return keys
+
+    def _missing(self, key: str):
+        if self.strict:
+            raise InvalidKey(_('Injected key `%(key)s` does not exist.') % {'key': key}, key=key)
+        self._unresolvable.add(key)
+
 
-    return inject(
-        template=template,
-        context=context,
-        calls=calls,
-        strict=strict
-    )
+def inject(template: Template, context: Dict[str, Any], strict: bool = True) -> Template:
+    """
+    Inject context to template.
+    """
+    return Injector(context, strict=strict).inject(template)
 
 
 def findkeys(s: str) -> Set[str]:
@@ -88,3 +160,8 @@ def findkeys(s: str) -> Set[str]:
     Find injected keys.
     """
     return {match[1] for match in KEY_RE.findall(s)}
+
+
+@functools.lru_cache(maxsize=4096)
+def _findall(s: str) -> Tuple[Tuple[str, str], ...]:
+    return tuple(KEY_RE.findall(s))
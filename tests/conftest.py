@@ -0,0 +1,40 @@
+import pytest
+
+from configfactory import registry
+from configfactory.api.authentication import clear_credentials_cache
+from configfactory.api.payloads import clear_payloads
+from configfactory.services.configsettings import clear_settings_snapshots
+
+
+@pytest.fixture(autouse=True)
+def settings_snapshots():
+    # Database changes are rolled back between tests without bumping
+    # store version, so resolved settings must not leak across tests.
+    clear_settings_snapshots()
+    yield
+    clear_settings_snapshots()
+
+
+@pytest.fixture(autouse=True)
+def api_credentials():
+    # Tokens of rolled back API settings must not stay authenticated.
+    clear_credentials_cache()
+    yield
+    clear_credentials_cache()
+
+
+@pytest.fixture(autouse=True)
+def api_payloads():
+    # Store version is rolled back between tests too.
+    clear_payloads()
+    yield
+    clear_payloads()
+
+
+@pytest.fixture(autouse=True)
+def environments_registry():
+    # Environments, components and registry version are rolled back
+    # between tests without signals.
+    registry.clear()
+    yield
+    registry.clear()
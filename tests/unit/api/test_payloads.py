@@ -0,0 +1,32 @@
+import gzip
+
+from configfactory.api import payloads
+from configfactory.api.payloads import IDENTITY, Payload, get_accepted_encoding
+
+
+def test_get_accepted_encoding():
+
+    assert get_accepted_encoding('') == IDENTITY
+    assert get_accepted_encoding('gzip, deflate') == 'gzip'
+    assert get_accepted_encoding('gzip;q=0, deflate') == IDENTITY
+    assert get_accepted_encoding('deflate, *') == next(iter(payloads.compressors))
+    assert get_accepted_encoding('GZIP;q=0.5') == 'gzip'
+    assert get_accepted_encoding('identity;q=1, gzip;q=0.5') == IDENTITY
+
+
+def test_get_accepted_encoding_quality():
+
+    assert get_accepted_encoding('gzip;q=1, br;q=0.1, zstd;q=0.5') == 'gzip'
+    assert get_accepted_encoding('gzip, *;q=0.1') == 'gzip'
+
+    # Server preference of equal qualities
+    assert get_accepted_encoding('gzip;q=0.5, *;q=0.5') == next(iter(payloads.compressors))
+
+
+def test_payload_encode():
+
+    payload = Payload(b'{"database.host":"localhost"}', content_type='application/json')
+
+    assert payload.encode() == b'{"database.host":"localhost"}'
+    assert gzip.decompress(payload.encode('gzip')) == b'{"database.host":"localhost"}'
+    assert payload.encode('gzip') is payload.encode('gzip')
@@ -0,0 +1,33 @@
+import pytest
+
+from configfactory.api.renderers import (
+    CBORRenderer,
+    DotEnvRenderer,
+    MessagePackRenderer,
+)
+
+data = {
+    'database.host': 'localhost',
+    'database.port': 5432,
+    'database.debug': True,
+    'database.password': None,
+}
+
+
+def test_dotenv_renderer():
+
+    assert DotEnvRenderer().render({'database.host': 'localhost'}).strip() == 'DATABASE_HOST=localhost'
+
+
+def test_msgpack_renderer():
+
+    msgpack = pytest.importorskip('msgpack')
+
+    assert msgpack.unpackb(MessagePackRenderer().render(data), raw=False) == data
+
+
+def test_cbor_renderer():
+
+    cbor2 = pytest.importorskip('cbor2')
+
+    assert cbor2.loads(CBORRenderer().render(data)) == data
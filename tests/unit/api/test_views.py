@@ -0,0 +1,521 @@
+import gzip
+from unittest import mock
+
+import pytest
+from django.test import TestCase, override_settings
+from guardian.shortcuts import assign_perm
+
+from configfactory import configstore
+from configfactory.models import APISettings
+from configfactory.services.configsettings import update_settings
+from configfactory.test.factories import (
+    ComponentFactory,
+    EnvironmentFactory,
+    UserFactory,
+)
+from configfactory.utils import json
+
+
+class SettingsAPIViewTestCase(TestCase):
+
+    def setUp(self):
+
+        self.base = EnvironmentFactory(name='Base', alias='base')
+        self.database = ComponentFactory(name='Database', alias='database')
+
+        update_settings(
+            environment=self.base,
+            component=self.database,
+            data={
+                'host': 'localhost',
+            }
+        )
+
+        user = UserFactory(is_superuser=True)
+        self.api_settings = APISettings.objects.create(user=user, is_enabled=True)
+        self.auth = 'Token {}'.format(self.api_settings.token)
+
+    def test_get_settings_token_cached(self):
+
+        response = self.client.get('/api/', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 200
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 200
+        assert 'base' in [environment['alias'] for environment in response.json()]
+
+        self.api_settings.is_enabled = False
+        self.api_settings.save()
+
+        response = self.client.get('/api/', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 401
+
+    def test_get_settings_token_permissions_changed(self):
+
+        user = UserFactory(username='john')
+        api_settings = APISettings.objects.create(user=user, is_enabled=True)
+        auth = 'Token {}'.format(api_settings.token)
+
+        response = self.client.get('/api/base/', HTTP_AUTHORIZATION=auth)
+
+        assert response.status_code == 404
+
+        assign_perm('view_environment', user, self.base)
+
+        response = self.client.get('/api/base/', HTTP_AUTHORIZATION=auth)
+
+        assert response.status_code == 200
+
+    def test_get_settings_etag(self):
+
+        response = self.client.get('/api/base/', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 200
+        assert response.json() == {'database.host': 'localhost'}
+        assert response['ETag']
+
+        etag = response['ETag']
+
+        # Store generation only
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                '/api/base/',
+                HTTP_AUTHORIZATION=self.auth,
+                HTTP_IF_NONE_MATCH=etag,
+            )
+
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+        assert not response.content
+
+    def test_get_settings_payload_cached(self):
+
+        response = self.client.get('/api/base/', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/json'
+
+        with mock.patch('configfactory.api.views.get_environment_settings') as get_environment_settings:
+            response = self.client.get(
+                '/api/base/',
+                HTTP_AUTHORIZATION=self.auth,
+                HTTP_ACCEPT_ENCODING='gzip, deflate',
+            )
+
+        assert not get_environment_settings.called
+        assert response.status_code == 200
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        assert json.loads(gzip.decompress(response.content)) == {'database.host': 'localhost'}
+
+    def test_get_settings_etag_changed(self):
+
+        response = self.client.get('/api/base/', HTTP_AUTHORIZATION=self.auth)
+        etag = response['ETag']
+
+        response = self.client.get('/api/base.env', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+        update_settings(
+            environment=self.base,
+            component=self.database,
+            data={
+                'host': '127.0.0.1',
+            }
+        )
+
+        response = self.client.get(
+            '/api/base/',
+            HTTP_AUTHORIZATION=self.auth,
+            HTTP_IF_NONE_MATCH=etag,
+        )
+
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+        assert response.json() == {'database.host': '127.0.0.1'}
+
+    def test_get_settings_fallback_chain_changed(self):
+
+        staging = EnvironmentFactory(name='Staging', alias='staging')
+        prod = EnvironmentFactory(name='Production', alias='prod')
+        EnvironmentFactory(name='Production EU', alias='eu', fallback=prod)
+
+        update_settings(
+            environment=staging,
+            component=self.database,
+            data={
+                'host': 'staging',
+            }
+        )
+
+        response = self.client.get('/api/eu/', HTTP_AUTHORIZATION=self.auth)
+        etag = response['ETag']
+
+        assert response.json() == {'database.host': 'localhost'}
+
+        # Middle of fallback chain changed, environment itself is not
+        prod.fallback = staging
+        prod.save()
+
+        response = self.client.get(
+            '/api/eu/',
+            HTTP_AUTHORIZATION=self.auth,
+            HTTP_IF_NONE_MATCH=etag,
+        )
+
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+        assert response.json() == {'database.host': 'staging'}
+
+    @override_settings(API_WAIT_INTERVAL=0.01)
+    def test_get_settings_wait_changes(self):
+
+        development = EnvironmentFactory(name='Development', alias='development')
+        version = configstore.get_version()
+
+        changes = iter([
+            (development, {'host': 'dev.local'}),
+            (self.base, {'host': '127.0.0.1'}),
+        ])
+
+        def change(seconds):
+            environment, data = next(changes)
+            update_settings(environment=environment, component=self.database, data=data)
+
+        with mock.patch('configfactory.api.events.is_supported', return_value=True), \
+                mock.patch('configfactory.api.views.time.sleep', side_effect=change) as sleep:
+            response = self.client.get(
+                '/api/base/',
+                data={'wait': 30, 'version': version},
+                HTTP_AUTHORIZATION=self.auth,
+            )
+
+        # Unrelated development environment change is skipped
+        assert sleep.call_count == 2
+        assert response.status_code == 200
+        assert response.json() == {'database.host': '127.0.0.1'}
+        assert int(response['X-Settings-Version']) == configstore.get_version()
+
+    @override_settings(API_WAIT_INTERVAL=0.01)
+    def test_get_settings_wait_timeout(self):
+
+        version = configstore.get_version()
+
+        with mock.patch('configfactory.api.events.is_supported', return_value=True):
+            response = self.client.get(
+                '/api/base/',
+                data={'wait': 0.05, 'version': version},
+                HTTP_AUTHORIZATION=self.auth,
+            )
+
+        assert response.status_code == 200
+        assert response.json() == {'database.host': 'localhost'}
+        assert int(response['X-Settings-Version']) == version
+
+    def test_get_settings_wait_outdated_version(self):
+
+        version = configstore.get_version()
+
+        with mock.patch('configfactory.api.events.is_supported', return_value=True), \
+                mock.patch('configfactory.api.views.time.sleep') as sleep:
+            response = self.client.get(
+                '/api/base/',
+                data={'wait': 30, 'version': version - 1},
+                HTTP_AUTHORIZATION=self.auth,
+            )
+
+        assert not sleep.called
+        assert response.status_code == 200
+
+    def test_get_settings_wait_not_supported(self):
+
+        version = configstore.get_version()
+
+        # Threaded workers answer at once
+        with mock.patch('configfactory.api.events.is_supported', return_value=False), \
+                mock.patch('configfactory.api.views.time.sleep') as sleep:
+            response = self.client.get(
+                '/api/base/',
+                data={'wait': 30, 'version': version},
+                HTTP_AUTHORIZATION=self.auth,
+            )
+
+        assert not sleep.called
+        assert response.status_code == 200
+        assert response.json() == {'database.host': 'localhost'}
+
+    def test_get_settings_wait_invalid(self):
+
+        response = self.client.get(
+            '/api/base/',
+            data={'wait': 'forever'},
+            HTTP_AUTHORIZATION=self.auth,
+        )
+
+        assert response.status_code == 400
+
+
+class ComponentSettingsAPIViewTestCase(TestCase):
+
+    def setUp(self):
+
+        self.base = EnvironmentFactory(name='Base', alias='base')
+        self.database = ComponentFactory(name='Database', alias='database')
+        self.cache = ComponentFactory(name='Cache', alias='cache')
+
+        update_settings(
+            environment=self.base,
+            component=self.database,
+            data={
+                'host': 'localhost',
+                'user': {
+                    'name': 'root',
+                },
+            }
+        )
+
+        update_settings(
+            environment=self.base,
+            component=self.cache,
+            data={
+                'host': 'localhost',
+            }
+        )
+
+        user = UserFactory(is_superuser=True)
+        api_settings = APISettings.objects.create(user=user, is_enabled=True)
+        self.auth = 'Token {}'.format(api_settings.token)
+
+    def test_get_component_settings(self):
+
+        response = self.client.get('/api/base/cache/', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 200
+        assert response.json() == {'cache.host': 'localhost'}
+
+    def test_get_component_settings_format(self):
+
+        response = self.client.get('/api/base/cache.env', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 200
+        assert response.content.decode().strip() == 'CACHE_HOST=localhost'
+
+    def test_get_component_settings_msgpack(self):
+
+        msgpack = pytest.importorskip('msgpack')
+
+        response = self.client.get('/api/base/cache.msgpack', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/msgpack'
+        assert msgpack.unpackb(response.content, raw=False) == {'cache.host': 'localhost'}
+
+        response = self.client.get(
+            '/api/base/cache/',
+            HTTP_AUTHORIZATION=self.auth,
+            HTTP_ACCEPT='application/msgpack',
+        )
+
+        assert response['Content-Type'] == 'application/msgpack'
+
+    def test_get_component_settings_not_found(self):
+
+        response = self.client.get('/api/base/unknown/', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 404
+
+    def test_get_settings_prefix(self):
+
+        response = self.client.get(
+            '/api/base/',
+            data={'prefix': 'database.user.'},
+            HTTP_AUTHORIZATION=self.auth,
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {'database.user.name': 'root'}
+
+        response = self.client.get(
+            '/api/base/',
+            data={'prefix': 'cach'},
+            HTTP_AUTHORIZATION=self.auth,
+        )
+
+        assert response.json() == {'cache.host': 'localhost'}
+
+
+class BatchSettingsAPIViewTestCase(TestCase):
+
+    def setUp(self):
+
+        self.base = EnvironmentFactory(name='Base', alias='base')
+        self.development = EnvironmentFactory(name='Development', alias='development')
+        self.production = EnvironmentFactory(name='Production', alias='production')
+        self.database = ComponentFactory(name='Database', alias='database')
+
+        update_settings(
+            environment=self.base,
+            component=self.database,
+            data={
+                'host': 'localhost',
+            }
+        )
+
+        update_settings(
+            environment=self.production,
+            component=self.database,
+            data={
+                'host': 'db.example.com',
+            }
+        )
+
+        self.user = UserFactory(username='john')
+        api_settings = APISettings.objects.create(user=self.user, is_enabled=True)
+        self.auth = 'Token {}'.format(api_settings.token)
+
+        assign_perm('view_environment', self.user, self.development)
+        assign_perm('view_environment', self.user, self.production)
+
+    def test_get_batch_settings(self):
+
+        response = self.client.get(
+            '/api/batch/',
+            data={'environments': 'development,production'},
+            HTTP_AUTHORIZATION=self.auth,
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            'development': {'database.host': 'localhost'},
+            'production': {'database.host': 'db.example.com'},
+        }
+
+    def test_get_batch_settings_single_store_read(self):
+
+        self.client.get('/api/', HTTP_AUTHORIZATION=self.auth)
+
+        with self.assertNumQueries(2):
+            # Store generation and data
+            response = self.client.get(
+                '/api/batch/',
+                data={'environments': 'development,production'},
+                HTTP_AUTHORIZATION=self.auth,
+            )
+
+        assert response.status_code == 200
+
+    def test_get_batch_settings_not_permitted(self):
+
+        response = self.client.get(
+            '/api/batch/',
+            data={'environments': 'development,base'},
+            HTTP_AUTHORIZATION=self.auth,
+        )
+
+        assert response.status_code == 404
+
+    def test_get_batch_settings_no_environments(self):
+
+        response = self.client.get('/api/batch/', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 400
+
+
+class SettingsEventsAPIViewTestCase(TestCase):
+
+    def setUp(self):
+
+        self.base = EnvironmentFactory(name='Base', alias='base')
+        self.database = ComponentFactory(name='Database', alias='database')
+        self.cache = ComponentFactory(name='Cache', alias='cache')
+
+        update_settings(
+            environment=self.base,
+            component=self.database,
+            data={
+                'host': 'localhost',
+                'port': 5432,
+            }
+        )
+
+        user = UserFactory(is_superuser=True)
+        api_settings = APISettings.objects.create(user=user, is_enabled=True)
+        self.auth = 'Token {}'.format(api_settings.token)
+
+        # Streams are served in async server mode only
+        patcher = mock.patch('configfactory.api.events.is_supported', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_settings_events(self):
+
+        version = configstore.get_version()
+
+        def change(seconds):
+            update_settings(
+                environment=self.base,
+                component=self.database,
+                data={
+                    'host': '127.0.0.1',
+                    'port': 5432,
+                }
+            )
+
+        response = self.client.get(
+            '/api/base/events/',
+            data={'keys': 'true'},
+            HTTP_AUTHORIZATION=self.auth,
+        )
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/event-stream'
+
+        events = iter(response.streaming_content)
+
+        assert next(events) == (
+            'id: {version}\n'
+            'event: version\n'
+            'data: {{"version":{version}}}\n\n'
+        ).format(version=version).encode()
+
+        with mock.patch('configfactory.api.events.time.sleep', side_effect=change):
+            event = next(events)
+
+        assert event == (
+            'id: {version}\n'
+            'event: change\n'
+            'data: {{"component":"database","version":{version},"keys":["database.host"]}}\n\n'
+        ).format(version=configstore.get_version()).encode()
+
+        response.close()
+
+    @override_settings(API_EVENTS_TIMEOUT=0)
+    def test_settings_events_timeout(self):
+
+        response = self.client.get('/api/base/events/', HTTP_AUTHORIZATION=self.auth)
+
+        assert len(list(response.streaming_content)) == 1
+
+    def test_settings_events_not_found(self):
+
+        response = self.client.get('/api/unknown/events/', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 404
+        assert response.content.startswith(b'event: error\ndata: {"detail":')
+
+    def test_settings_events_async_mode_required(self):
+
+        with mock.patch('configfactory.api.events.is_supported', return_value=False):
+            response = self.client.get('/api/base/events/', HTTP_AUTHORIZATION=self.auth)
+
+        assert response.status_code == 503
+        assert response.content == (
+            b'event: error\n'
+            b'data: {"detail":"Settings events require async server mode."}\n\n'
+        )
@@ -0,0 +1,65 @@
+import pytest
+
+from configfactory.configstore import DatabaseConfigStore
+
+
+@pytest.fixture()
+def store(db):
+    return DatabaseConfigStore()
+
+
+def test_update_data(store: DatabaseConfigStore):
+    store.update('dev', 'db', 'dev:db:data')
+    store.update('dev', 'db', 'dev:db:changed')
+
+    assert store.all() == {
+        'dev': {
+            'db': 'dev:db:changed'
+        }
+    }
+    assert store.generation() == 2
+
+
+def test_get_many_data(store: DatabaseConfigStore, django_assert_num_queries):
+    store.update('base', 'db', 'base:db:data')
+    store.update('dev', 'db', 'dev:db:data')
+    store.update('dev', 'redis', 'dev:redis:data')
+
+    with django_assert_num_queries(1):
+        data = store.get_many([('base', 'db'), ('dev', 'db'), ('prod', 'db')])
+
+    assert data == {
+        ('base', 'db'): 'base:db:data',
+        ('dev', 'db'): 'dev:db:data',
+    }
+
+
+def test_update_many_data(store: DatabaseConfigStore, django_assert_max_num_queries):
+    store.update('dev', 'db', 'dev:db:data')
+
+    data = {
+        (environment, f'component{i}'): f'{environment}:{i}'
+        for environment in ('dev', 'prod')
+        for i in range(100)
+    }
+
+    with django_assert_max_num_queries(10):
+        store.update_many(data)
+
+    assert store.get('dev', 'component0') == 'dev:0'
+    assert store.get('dev', 'db') == 'dev:db:data'
+    assert len(store.get_environment('prod')) == 100
+    assert store.generation() == 2
+
+
+def test_delete_many_data(store: DatabaseConfigStore):
+    store.update('dev', 'db', 'dev:db:data')
+    store.update('dev', 'redis', 'dev:redis:data')
+    store.update('prod', 'db', 'prod:db:data')
+    store.delete_many([('dev', 'db'), ('dev', 'redis')])
+
+    assert store.all() == {
+        'prod': {
+            'db': 'prod:db:data'
+        }
+    }
@@ -0,0 +1,276 @@
+import time
+
+import pytest
+
+from configfactory import configstore
+from configfactory.configstore import (
+    FileSystemConfigStore,
+    LiveFileSystemConfigStore,
+    filesystem,
+)
+from configfactory.services.configsettings import get_settings, update_settings
+from configfactory.test.factories import ComponentFactory, EnvironmentFactory
+from configfactory.utils import inotify
+
+
+@pytest.fixture()
+def store(tmpdir):
+    return FileSystemConfigStore(str(tmpdir))
+
+
+def test_empty_data(store: FileSystemConfigStore):
+    assert not store.all()
+
+
+def test_update_data(store: FileSystemConfigStore):
+    store.update('dev', 'db', 'dev:db:data')
+
+    assert store.all() == {
+        'dev': {
+            'db': 'dev:db:data'
+        }
+    }
+
+
+def test_delete_data(store: FileSystemConfigStore):
+    store.update('dev', 'db', 'dev:db:data')
+    store.delete('dev', 'db')
+
+    assert store.all() == {
+        'dev': {}
+    }
+
+
+def test_generation(store: FileSystemConfigStore, tmpdir):
+    assert store.generation() == 0
+
+    store.update('dev', 'db', 'dev:db:data')
+    store.delete('dev', 'db')
+
+    assert store.generation() == 2
+    assert FileSystemConfigStore(str(tmpdir)).generation() == 2
+
+
+def _replace(path, data: str):
+    # Atomic write, as done by deployment tools
+    tmp_path = path.dirpath(f'.{path.basename}.tmp')
+    tmp_path.write(data)
+    tmp_path.rename(path)
+
+
+def test_generation_external_changes(store: FileSystemConfigStore, tmpdir):
+    store.update('dev', 'db', 'dev:db:data')
+
+    assert store.generation() == 1
+
+    # Directories mtime must differ from previous change
+    time.sleep(0.01)
+    _replace(tmpdir.join('dev', 'db.json'), 'dev:db:changed')
+
+    assert store.generation() == 2
+    assert store.generation() == 2
+    assert FileSystemConfigStore(str(tmpdir)).generation() == 2
+    assert store.get('dev', 'db') == 'dev:db:changed'
+
+    time.sleep(0.01)
+    tmpdir.mkdir('prod').join('db.json').write('prod:db:data')
+
+    assert store.generation() == 3
+
+    time.sleep(0.01)
+    tmpdir.join('prod', 'db.json').remove()
+
+    assert store.generation() == 4
+
+
+def test_get_data(store: FileSystemConfigStore):
+    store.update('dev', 'db', 'dev:db:data')
+
+    assert store.get('dev', 'db') == 'dev:db:data'
+    assert store.get('dev', 'redis') is None
+    assert store.get('prod', 'db') is None
+
+
+def test_get_many_data(store: FileSystemConfigStore):
+    store.update('base', 'db', 'base:db:data')
+    store.update('dev', 'db', 'dev:db:data')
+    store.update('dev', 'redis', 'dev:redis:data')
+
+    assert store.get_many([('base', 'db'), ('dev', 'db'), ('prod', 'db')]) == {
+        ('base', 'db'): 'base:db:data',
+        ('dev', 'db'): 'dev:db:data',
+    }
+
+
+def test_get_environment_data(store: FileSystemConfigStore):
+    store.update('base', 'db', 'base:db:data')
+    store.update('dev', 'db', 'dev:db:data')
+    store.update('dev', 'redis', 'dev:redis:data')
+
+    assert store.get_environment('dev') == {
+        'db': 'dev:db:data',
+        'redis': 'dev:redis:data',
+    }
+    assert store.get_environment('prod') == {}
+
+
+def test_reload_changed_files_only(store: FileSystemConfigStore, tmpdir, monkeypatch):
+    store.update('dev', 'db', 'dev:db:data')
+    store.update('dev', 'redis', 'dev:redis:data')
+    store.all()
+
+    tmpdir.join('dev', 'redis.json').write('dev:redis:changed')
+
+    opened = []
+
+    def _open(path, *args, **kwargs):
+        opened.append(path)
+        return open(path, *args, **kwargs)
+
+    monkeypatch.setattr(filesystem, 'open', _open, raising=False)
+
+    assert store.all() == {
+        'dev': {
+            'db': 'dev:db:data',
+            'redis': 'dev:redis:changed',
+        }
+    }
+    assert opened == [str(tmpdir.join('dev', 'redis.json'))]
+
+
+def test_reload_deleted_files(store: FileSystemConfigStore, tmpdir):
+    store.update('dev', 'db', 'dev:db:data')
+    store.all()
+
+    tmpdir.join('dev', 'db.json').remove()
+
+    assert store.all() == {
+        'dev': {}
+    }
+    assert store.get('dev', 'db') is None
+
+
+def test_update_atomic(store: FileSystemConfigStore, tmpdir):
+    store.update('dev', 'db', 'dev:db:data')
+    store.update('dev', 'db', 'dev:db:changed')
+
+    assert tmpdir.join('dev').listdir() == [tmpdir.join('dev', 'db.json')]
+    assert store.get('dev', 'db') == 'dev:db:changed'
+
+
+def test_update_many_data(store: FileSystemConfigStore):
+    store.update('dev', 'db', 'dev:db:data')
+    store.update_many({
+        ('dev', 'db'): 'dev:db:changed',
+        ('prod', 'db'): 'prod:db:data',
+    })
+
+    assert store.all() == {
+        'dev': {
+            'db': 'dev:db:changed'
+        },
+        'prod': {
+            'db': 'prod:db:data'
+        }
+    }
+    assert store.generation() == 2
+
+
+def test_delete_many_data(store: FileSystemConfigStore):
+    store.update('dev', 'db', 'dev:db:data')
+    store.update('dev', 'redis', 'dev:redis:data')
+    store.delete_many([('dev', 'db'), ('dev', 'redis'), ('prod', 'db')])
+
+    assert store.all() == {
+        'dev': {}
+    }
+    assert store.generation() == 3
+
+
+@pytest.fixture()
+def live_store(tmpdir):
+    if not inotify.is_supported():
+        pytest.skip('inotify is not supported')
+    store = LiveFileSystemConfigStore(str(tmpdir))
+    yield store
+    store.close()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_live_store_update_data(live_store: LiveFileSystemConfigStore):
+    live_store.update('dev', 'db', 'dev:db:data')
+
+    assert live_store.get('dev', 'db') == 'dev:db:data'
+    assert live_store.generation() == 1
+
+
+def test_live_store_external_changes(live_store: LiveFileSystemConfigStore, tmpdir):
+    assert live_store.all() == {}
+
+    generation = live_store.generation()
+    tmpdir.mkdir('dev').join('db.json').write('dev:db:data')
+
+    assert _wait_for(lambda: live_store.get('dev', 'db') == 'dev:db:data')
+    assert _wait_for(lambda: live_store.generation() > generation)
+
+    generation = live_store.generation()
+    tmpdir.join('dev', 'db.json').write('dev:db:changed')
+
+    assert _wait_for(lambda: live_store.get('dev', 'db') == 'dev:db:changed')
+    assert _wait_for(lambda: live_store.generation() > generation)
+
+    generation = live_store.generation()
+    tmpdir.join('dev', 'db.json').remove()
+
+    assert _wait_for(lambda: live_store.all() == {'dev': {}})
+    assert _wait_for(lambda: live_store.generation() > generation)
+
+
+def test_live_store_generation_shared(live_store: LiveFileSystemConfigStore, tmpdir):
+    other_store = LiveFileSystemConfigStore(str(tmpdir))
+    live_store.update('dev', 'db', 'dev:db:data')
+    # File mtime must differ from stamp mtime
+    time.sleep(0.01)
+    tmpdir.join('dev', 'db.json').write('dev:db:changed')
+
+    # Processes agree on generation once watchers caught up,
+    # outside change is counted once
+    try:
+        assert _wait_for(lambda: other_store.get('dev', 'db') == 'dev:db:changed')
+        assert _wait_for(lambda: live_store.get('dev', 'db') == 'dev:db:changed')
+        assert _wait_for(lambda: live_store.generation() == other_store.generation() == 2)
+    finally:
+        other_store.close()
+
+
+@pytest.mark.django_db
+def test_live_store_external_changes_settings(live_store: LiveFileSystemConfigStore, tmpdir, monkeypatch):
+    environment = EnvironmentFactory(alias='base', name='Base')
+    component = ComponentFactory(alias='db', name='Database')
+    monkeypatch.setattr(configstore, '_store', live_store)
+
+    update_settings(environment, component, {'user': 'a'})
+
+    assert get_settings(environment, component) == {'user': 'a'}
+
+    tmpdir.join('base', 'db.json').write('{"user":"bbb"}')
+
+    assert _wait_for(lambda: live_store.get('base', 'db') == '{"user":"bbb"}')
+    assert get_settings(environment, component) == {'user': 'bbb'}
+
+
+def test_live_store_generation(live_store: LiveFileSystemConfigStore, tmpdir):
+    assert live_store.generation() == 0
+
+    FileSystemConfigStore(str(tmpdir)).update('dev', 'db', 'dev:db:data')
+
+    assert _wait_for(lambda: live_store.generation() == 1)
+    assert live_store.get('dev', 'db') == 'dev:db:data'
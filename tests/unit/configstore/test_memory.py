@@ -29,3 +29,72 @@ def test_delete_data(store: MemoryConfigStore):
     assert store.all() == {
         'dev': {}
     }
+
+
+def test_generation(store: MemoryConfigStore):
+    assert store.generation() == 0
+
+    store.update('dev', 'db', 'dev:db:data')
+    store.delete('dev', 'db')
+
+    assert store.generation() == 2
+
+
+def test_get_data(store: MemoryConfigStore):
+    store.update('dev', 'db', 'dev:db:data')
+
+    assert store.get('dev', 'db') == 'dev:db:data'
+    assert store.get('dev', 'redis') is None
+    assert store.get('prod', 'db') is None
+
+
+def test_get_many_data(store: MemoryConfigStore):
+    store.update('base', 'db', 'base:db:data')
+    store.update('dev', 'db', 'dev:db:data')
+    store.update('dev', 'redis', 'dev:redis:data')
+
+    assert store.get_many([('base', 'db'), ('dev', 'db'), ('prod', 'db')]) == {
+        ('base', 'db'): 'base:db:data',
+        ('dev', 'db'): 'dev:db:data',
+    }
+
+
+def test_get_environment_data(store: MemoryConfigStore):
+    store.update('base', 'db', 'base:db:data')
+    store.update('dev', 'db', 'dev:db:data')
+    store.update('dev', 'redis', 'dev:redis:data')
+
+    assert store.get_environment('dev') == {
+        'db': 'dev:db:data',
+        'redis': 'dev:redis:data',
+    }
+    assert store.get_environment('prod') == {}
+
+
+def test_update_many_data(store: MemoryConfigStore):
+    store.update('dev', 'db', 'dev:db:data')
+    store.update_many({
+        ('dev', 'db'): 'dev:db:changed',
+        ('prod', 'db'): 'prod:db:data',
+    })
+
+    assert store.all() == {
+        'dev': {
+            'db': 'dev:db:changed'
+        },
+        'prod': {
+            'db': 'prod:db:data'
+        }
+    }
+    assert store.generation() == 2
+
+
+def test_delete_many_data(store: MemoryConfigStore):
+    store.update('dev', 'db', 'dev:db:data')
+    store.update('dev', 'redis', 'dev:redis:data')
+    store.delete_many([('dev', 'db'), ('dev', 'redis'), ('prod', 'db')])
+
+    assert store.all() == {
+        'dev': {}
+    }
+    assert store.generation() == 3
@@ -2,7 +2,7 @@ import pytest
 from django.test import TestCase
 
 from configfactory.exceptions import ComponentDeleteError
-from configfactory.models import Config
+from configfactory.models import Component, Config
 from configfactory.services.components import delete_component
 from configfactory.services.configsettings import update_settings
 from configfactory.test.factories import ComponentFactory, EnvironmentFactory
@@ -65,3 +65,29 @@ class ComponentsServiceTestCase(TestCase):
         delete_component(hosts)
 
         assert not Config.objects.filter(environment=self.base, component=hosts).exists()
+
+    def test_delete_component_referred_by_others(self):
+
+        hosts = ComponentFactory(name='Hosts', alias='hosts')
+        database = ComponentFactory(name='Database', alias='database')
+        redis = ComponentFactory(name='Redis', alias='redis')
+
+        update_settings(
+            environment=self.base,
+            component=hosts,
+            data={
+                'db': 'localhost'
+            }
+        )
+
+        update_settings(
+            environment=self.base,
+            component=database,
+            data={
+                'host': '${hosts.db}',
+            }
+        )
+
+        delete_component(redis)
+
+        assert not Component.objects.filter(alias='redis').exists()
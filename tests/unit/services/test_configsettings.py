@@ -1,13 +1,21 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
 import pytest
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from configfactory import configstore
+from configfactory.configstore import FileSystemConfigStore
 from configfactory.exceptions import InvalidSettingsError
 from configfactory.services.configsettings import (
+    delete_settings,
     get_all_settings,
     get_environment_settings,
     get_settings,
     get_settings_inject_keys,
+    get_settings_referred_keys,
     inject_settings,
     update_settings,
     validate_settings,
@@ -69,6 +77,38 @@ class ConfigSettingsServiceTestCase(TestCase):
             }
         }
 
+    @override_settings(ENCRYPT_ENABLED=True, SECURE_KEYS=['pass'])
+    def test_get_all_settings_decrypted(self):
+
+        update_settings(
+            environment=self.base,
+            component=self.db,
+            data={
+                'user': 'root',
+                'pass': 'secret'
+            }
+        )
+
+        update_settings(
+            environment=self.base,
+            component=self.redis,
+            data={
+                'pass': 'secret'
+            }
+        )
+
+        data = get_all_settings()
+
+        assert data['base'] == {
+            'db': {
+                'user': 'root',
+                'pass': 'secret'
+            },
+            'redis': {
+                'pass': 'secret'
+            },
+        }
+
     def test_get_all_settings_cached(self):
 
         with self.assertNumQueries(3):
@@ -76,12 +116,70 @@ class ConfigSettingsServiceTestCase(TestCase):
             get_all_settings()
             get_all_settings()
 
-        with self.assertNumQueries(1):
+        # Store generation is read once, before data is cached
+        with self.assertNumQueries(2):
             with configstore.cached_data():
                 get_all_settings()
                 get_all_settings()
                 get_all_settings()
 
+    def test_get_settings_snapshot_cached(self):
+
+        update_settings(
+            environment=self.dev,
+            component=self.db,
+            data={
+                'user': 'devuser',
+            }
+        )
+
+        with configstore.cached_data():
+            data = get_settings(environment=self.dev, component=self.db)
+
+        with configstore.cached_data(), self.assertNumQueries(1):
+            assert get_settings(environment=self.dev, component=self.db) is data
+
+        update_settings(
+            environment=self.dev,
+            component=self.db,
+            data={
+                'user': 'produser',
+            },
+            validate=False
+        )
+
+        assert get_settings(environment=self.dev, component=self.db) == {
+            'user': 'produser',
+        }
+
+    def test_get_settings_filesystem_external_changes(self):
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(configstore, '_store', FileSystemConfigStore(directory)):
+
+            update_settings(
+                environment=self.base,
+                component=self.db,
+                data={
+                    'user': 'a',
+                }
+            )
+
+            assert get_settings(environment=self.base, component=self.db) == {
+                'user': 'a',
+            }
+
+            # Replaced outside of the store, e.g. by deployment tools
+            time.sleep(0.01)
+            tmp_path = os.path.join(directory, 'base', '.db.json.tmp')
+            with open(tmp_path, 'w') as fp:
+                fp.write('{"user":"bbb"}')
+            os.replace(tmp_path, os.path.join(directory, 'base', 'db.json'))
+
+            assert get_settings(environment=self.base, component=self.db) == {
+                'user': 'bbb',
+            }
+
     def test_get_env_settings(self):
 
         #########################
@@ -151,6 +249,27 @@ class ConfigSettingsServiceTestCase(TestCase):
             }
         }
 
+    def test_get_env_settings_single_store_read(self):
+
+        update_settings(
+            environment=self.dev,
+            component=self.db,
+            data={
+                'user': 'devuser',
+            }
+        )
+
+        # Store generation and batched config read,
+        # environment layers are cached by update
+        with self.assertNumQueries(2):
+            get_environment_settings(self.dev, components=[
+                self.hosts,
+                self.users,
+                self.credentials,
+                self.db,
+                self.redis,
+            ])
+
     def test_get_component_settings(self):
 
         update_settings(
@@ -232,6 +351,43 @@ class ConfigSettingsServiceTestCase(TestCase):
             'port': 3452
         }
 
+    def test_get_fallback_chain_environment_settings(self):
+
+        staging = EnvironmentFactory(alias='stag', name='Staging')
+        prod = EnvironmentFactory(alias='prod-main', name='Production main', fallback=staging)
+        prod_eu = EnvironmentFactory(alias='prod-eu', name='Production EU', fallback=prod)
+
+        for environment, data in [
+            (self.base, {'host': 'localhost', 'port': 3452, 'user': 'root', 'pool': {'size': 1, 'timeout': 5}}),
+            (staging, {'host': 'staging.local', 'pool': {'size': 5}}),
+            (prod, {'host': 'prod.local', 'user': 'admin'}),
+            (prod_eu, {'host': 'eu.prod.local'}),
+        ]:
+            update_settings(environment=environment, component=self.db, data=data)
+
+        assert get_settings(environment=prod_eu, component=self.db) == {
+            'host': 'eu.prod.local',
+            'port': 3452,
+            'user': 'admin',
+            'pool': {
+                'size': 5,
+                'timeout': 5,
+            },
+        }
+
+        prod.fallback = None
+        prod.save()
+
+        assert get_settings(environment=prod_eu, component=self.db) == {
+            'host': 'eu.prod.local',
+            'port': 3452,
+            'user': 'admin',
+            'pool': {
+                'size': 1,
+                'timeout': 5,
+            },
+        }
+
     def test_get_missing_fallback_environment_settings(self):
 
         staging = EnvironmentFactory(alias='stag', name='Staging', fallback=self.dev)
@@ -370,6 +526,50 @@ class ConfigSettingsServiceTestCase(TestCase):
             }
         }
 
+    def test_get_referred_keys_index_updated(self):
+
+        update_settings(
+            environment=self.base,
+            component=self.hosts,
+            data={
+                'db': 'localhost',
+                'redis': 'localhost',
+            }
+        )
+
+        update_settings(
+            environment=self.base,
+            component=self.db,
+            data={
+                'host': '${hosts.db}',
+            }
+        )
+
+        assert get_settings_referred_keys(self.base, self.hosts) == {
+            'db': {'hosts.db'}
+        }
+
+        update_settings(
+            environment=self.base,
+            component=self.redis,
+            data={
+                'host': '${hosts.redis}',
+            }
+        )
+
+        with configstore.cached_data(), self.assertNumQueries(2):
+            # Store generation and changed component read only
+            assert get_settings_referred_keys(self.base, self.hosts) == {
+                'db': {'hosts.db'},
+                'redis': {'hosts.redis'},
+            }
+
+        delete_settings(self.base, self.db)
+
+        assert get_settings_referred_keys(self.base, self.hosts) == {
+            'redis': {'hosts.redis'},
+        }
+
     def test_validate_settings_invalid_key(self):
 
         with pytest.raises(InvalidSettingsError) as exc_info:
@@ -388,6 +588,37 @@ class ConfigSettingsServiceTestCase(TestCase):
 
         assert exc_info.value.message == 'Injected key `hosts.db` does not exist.'
 
+    def test_validate_settings_circular_keys(self):
+
+        update_settings(
+            environment=self.base,
+            component=self.hosts,
+            data={
+                'db': '${db.host}'
+            },
+            validate=False
+        )
+
+        update_settings(
+            environment=self.base,
+            component=self.db,
+            data={
+                'host': '${hosts.db}'
+            },
+            validate=False
+        )
+
+        with pytest.raises(InvalidSettingsError) as exc_info:
+            validate_settings(
+                environment=self.base,
+                component=self.db,
+                data={
+                    'host': '${hosts.db}',
+                }
+            )
+
+        assert exc_info.value.message == 'Circular key injections detected: hosts.db -> db.host -> hosts.db.'
+
     def test_validate_settings_invalid_key_reference(self):
 
         update_settings(
@@ -0,0 +1,31 @@
+from django.test import TestCase
+
+from configfactory.services.environments import get_environment_layers
+from configfactory.test.factories import EnvironmentFactory
+
+
+class EnvironmentsServiceTestCase(TestCase):
+
+    def test_get_environment_layers(self):
+
+        base = EnvironmentFactory(alias='base', name='Base')
+        staging = EnvironmentFactory(alias='stag', name='Staging')
+        prod = EnvironmentFactory(alias='prod-main', name='Production main', fallback=staging)
+        prod_eu = EnvironmentFactory(alias='prod-eu', name='Production EU', fallback=prod)
+
+        assert get_environment_layers(base) == ('base',)
+        assert get_environment_layers(staging) == ('base', 'stag')
+        assert get_environment_layers(prod_eu) == ('base', 'stag', 'prod-main', 'prod-eu')
+
+        with self.assertNumQueries(0):
+            get_environment_layers(prod)
+
+    def test_get_environment_layers_circular_fallback(self):
+
+        staging = EnvironmentFactory(alias='stag', name='Staging')
+        prod = EnvironmentFactory(alias='prod-main', name='Production main', fallback=staging)
+
+        staging.fallback = prod
+        staging.save()
+
+        assert get_environment_layers(prod) == ('base', 'stag', 'prod-main')
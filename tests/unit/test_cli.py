@@ -0,0 +1,48 @@
+import subprocess
+import sys
+from unittest import mock
+
+from click.testing import CliRunner
+
+from configfactory.cli import commands
+
+
+def test_cli_import_without_django_db():
+
+    # Async workers patch thread locals, which must happen before
+    # Django database connections are created.
+    code = (
+        'import sys, configfactory.cli; '
+        'sys.exit(any(name.startswith("django.db") for name in sys.modules))'
+    )
+
+    assert subprocess.run([sys.executable, '-c', code]).returncode == 0
+
+
+def test_start_async():
+
+    calls = mock.Mock()
+    gevent = mock.Mock(monkey=calls.monkey)
+
+    with mock.patch.dict(sys.modules, {'gevent': gevent}), \
+            mock.patch('configfactory.support.server.ConfigFactoryServer', calls.server), \
+            mock.patch('configfactory.scheduler.run'), \
+            mock.patch.object(commands, 'Process'):
+        result = CliRunner().invoke(commands.start_command, ['--async', '--workers', '1'])
+
+    assert result.exit_code == 0, result.output
+    assert [call[0] for call in calls.mock_calls[:2]] == ['monkey.patch_all', 'server']
+
+    options = calls.server.call_args[1]['options']
+
+    assert options['worker_class'] == 'gevent'
+    assert options['threads'] is None
+
+
+def test_start_async_without_gevent():
+
+    with mock.patch.dict(sys.modules, {'gevent': None}):
+        result = CliRunner().invoke(commands.start_command, ['--async'])
+
+    assert result.exit_code == 2
+    assert 'Async mode requires gevent' in result.output
@@ -0,0 +1,73 @@
+from django.test import TestCase, override_settings
+
+from configfactory import registry
+from configfactory.models import Component, Generation
+from configfactory.test.factories import ComponentFactory, EnvironmentFactory
+
+
+class RegistryTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+
+        cls.base = EnvironmentFactory(alias='base', name='Base')
+        cls.staging = EnvironmentFactory(alias='stag', name='Staging')
+        cls.prod = EnvironmentFactory(alias='prod', name='Production', fallback=cls.staging)
+        cls.db = ComponentFactory(alias='db', name='Database')
+
+    def test_get_cached(self):
+
+        assert registry.get_environment('prod') == self.prod
+        assert registry.get_component('db') == self.db
+
+        with self.assertNumQueries(0):
+            assert registry.get_environment('stag') == self.staging
+            assert registry.get_environment('unknown') is None
+            assert registry.get_component_aliases() == ['db']
+            assert registry.get_environment_layers('prod') == ('base', 'stag', 'prod')
+            assert registry.get_environment('prod').fallback == self.staging
+
+    def test_component_saved(self):
+
+        version = registry.get_version()
+
+        ComponentFactory(alias='cache', name='Cache')
+
+        assert registry.get_version() == version + 1
+        assert registry.get_component_aliases() == ['cache', 'db']
+
+    def test_environment_fallback_changed(self):
+
+        assert registry.get_environment_layers('prod') == ('base', 'stag', 'prod')
+
+        self.prod.fallback = None
+        self.prod.save()
+
+        assert registry.get_environment_layers('prod') == ('base', 'prod')
+
+    @override_settings(REGISTRY_CHECK_INTERVAL=0)
+    def test_changed_by_other_process(self):
+
+        registry.get_version()
+
+        # Other process changes without local signals
+        Generation.objects.increment(registry.generation_name)
+        Component.objects.filter(alias='db').update(name='Database server')
+
+        assert registry.get_component('db').name == 'Database server'
+
+    def test_get_component_schema(self):
+
+        self.db.schema = {'type': 'object'}
+        self.db.save()
+
+        component = registry.get_component('db')
+
+        assert registry.get_component_schema(component) == {'type': 'object'}
+
+        with self.assertNumQueries(0):
+            assert registry.get_component_schema(component) is registry.get_component_schema(component)
+
+        component.schema_json = '{"type": "string"}'
+
+        assert registry.get_component_schema(component) == {'type': 'string'}
@@ -0,0 +1,41 @@
+from unittest import mock
+
+from configfactory.utils.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    assert cache.get('a') == 1
+
+    cache.set('c', 3)
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert len(cache) == 2
+
+
+def test_lru_cache_expires_entries():
+
+    cache = LRUCache(maxsize=2, ttl=10)
+
+    with mock.patch('time.monotonic', return_value=100):
+        cache.set('a', 1)
+
+    with mock.patch('time.monotonic', return_value=105):
+        assert cache.get('a') == 1
+
+    with mock.patch('time.monotonic', return_value=110):
+        assert cache.get('a') is None
+
+
+def test_lru_cache_disabled():
+
+    cache = LRUCache(maxsize=0)
+    cache.set('a', 1)
+
+    assert cache.get('a') is None
@@ -100,3 +100,71 @@ def test_flatten_dict():
         'h.i': 1,
         'h.j': 2,
     }
+
+
+def test_layered_dict():
+
+    base = {
+        'a': 'one',
+        'b': {
+            'c': 'two',
+            'd': {
+                'e': 'three'
+            },
+        },
+        'f': {
+            'g': 'four'
+        },
+    }
+    env = {
+        'a': 'one - layered',
+        'b': {
+            'c': 'two - layered',
+            'h': 'five',
+        },
+        'f': 'four - replaced',
+        'i': 'six',
+    }
+
+    layered = dictutil.LayeredDict(base, env)
+
+    assert list(layered) == ['a', 'b', 'f', 'i']
+    assert len(layered) == 4
+    assert 'i' in layered
+    assert 'x' not in layered
+    assert layered['a'] == 'one - layered'
+    assert layered['b']['d'] is base['b']['d']
+    assert layered == {
+        'a': 'one - layered',
+        'b': {
+            'c': 'two - layered',
+            'd': {
+                'e': 'three'
+            },
+            'h': 'five',
+        },
+        'f': 'four - replaced',
+        'i': 'six',
+    }
+
+
+def test_materialize_shares_unmerged_subtrees():
+
+    base = {
+        'a': {'b': 'one'},
+        'c': {'d': 'two'},
+    }
+    env = {
+        'c': {'e': 'three'},
+    }
+
+    actual = dictutil.materialize(dictutil.LayeredDict(base, env))
+
+    assert type(actual) is dict
+    assert type(actual['c']) is dict
+    assert actual == {
+        'a': {'b': 'one'},
+        'c': {'d': 'two', 'e': 'three'},
+    }
+    assert actual['a'] is base['a']
+    assert dictutil.materialize(dictutil.LayeredDict(base, {})) is base
@@ -40,3 +40,102 @@ def test_traverse_upper():
             }
         ]
     }
+
+
+def test_traverse_paths():
+
+    paths = []
+
+    iterutil.traverse({
+        'a': 'one',
+        'b': {
+            'c': ['two', {'d': 'three'}],
+        },
+        'e': [],
+    }, lambda v, p: paths.append(list(p)))
+
+    assert paths == [
+        ['a'],
+        ['b', 'c', 0],
+        ['b', 'c', 1, 'd'],
+    ]
+
+
+def test_traverse_copy():
+
+    data = {'a': {'b': 'one'}, 'c': []}
+
+    actual = iterutil.traverse(data, lambda v, p: v)
+
+    assert actual == data
+    assert actual is not data
+    assert actual['a'] is not data['a']
+    assert actual['c'] is not data['c']
+
+
+def test_traverse_copy_on_change():
+
+    data = {
+        'a': {'b': 'one', 'c': ['two']},
+        'd': {'e': 'three'},
+    }
+
+    actual = iterutil.traverse(data, lambda v, p: v, copy_on_change=True)
+
+    assert actual is data
+
+    actual = iterutil.traverse(
+        data,
+        lambda v, p: v.upper() if v == 'two' else v,
+        copy_on_change=True,
+    )
+
+    assert actual == {
+        'a': {'b': 'one', 'c': ['TWO']},
+        'd': {'e': 'three'},
+    }
+    assert data['a']['c'] == ['two']
+    assert actual['d'] is data['d']
+
+
+def test_traverse_prune():
+
+    data = {
+        'a': {'b': 'one'},
+        'c': {'d': 'two', 'e': 'three'},
+    }
+    calls = []
+
+    def callback(value, path):
+        calls.append(list(path))
+        return value.upper()
+
+    actual = iterutil.traverse(
+        data,
+        callback,
+        copy_on_change=True,
+        prune=lambda path: path[:2] == ['c', 'd'] or path == ['a'],
+    )
+
+    assert actual == {
+        'a': {'b': 'one'},
+        'c': {'d': 'two', 'e': 'THREE'},
+    }
+    assert actual['a'] is data['a']
+    assert calls == [['c', 'e']]
+
+
+def test_traverse_deep():
+
+    data = value = {}
+    for _ in range(5000):
+        value['a'] = {}
+        value = value['a']
+    value['a'] = 'one'
+
+    actual = iterutil.traverse(data, lambda v, p: len(p))
+
+    for _ in range(5000):
+        actual = actual['a']
+
+    assert actual == {'a': 5001}
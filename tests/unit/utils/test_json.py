@@ -0,0 +1,110 @@
+import datetime
+import decimal
+import json as stdlib_json
+import random
+import uuid
+
+import pytest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import override_settings
+
+from configfactory.utils import json
+
+orjson = pytest.importorskip('orjson')
+
+objects = [
+    {},
+    [],
+    {'host': 'localhost', 'port': 5432, 'debug': True, 'password': None},
+    {'nested': {'list': [1, 2.5, 'three', None, False, {'a': []}]}},
+    {'unicode': 'Привет', 'emoji': '\U0001F600'},
+    {'escapes': 'quote " backslash \\ newline \n tab \t control \x01 slash / delete \x7f'},
+    {'\x7f': 'delete key'},
+    {'html': '<script>&</script>', 'separators': '  '},
+    {'floats': [0.1, -0.0, 1 / 3, 1e16, 1e-5, 1e-4, 123456789.123, 5e-324, 1.7976931348623157e308]},
+    {'nan': float('nan'), 'inf': float('inf'), 'ninf': float('-inf')},
+    {'big': 2 ** 64, 'negative_big': -2 ** 63 - 1, 'max': 2 ** 63 - 1},
+    {1: 'int key', None: 'none key', 2.5: 'float key'},
+    {True: 'bool key', False: 'bool key'},
+    {'tuple': (1, 2, 3)},
+    {'datetime': datetime.datetime(2018, 1, 2, 3, 4, 5, 678901)},
+    {'aware': datetime.datetime(2018, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)},
+    {'date': datetime.date(2018, 1, 2), 'time': datetime.time(3, 4, 5, 678)},
+    {'decimal': decimal.Decimal('1.10'), 'uuid': uuid.UUID('12345678123456781234567812345678')},
+    {'timedelta': datetime.timedelta(days=1, seconds=5)},
+    'string',
+    12,
+    None,
+]
+
+
+def stdlib_dumps(obj):
+    return stdlib_json.dumps(obj, separators=(',', ':'), cls=DjangoJSONEncoder)
+
+
+@pytest.fixture
+def orjson_backend():
+    with override_settings(JSON_BACKEND='orjson'):
+        yield
+
+
+@pytest.mark.parametrize('obj', objects)
+def test_dumps_equivalence(obj, orjson_backend):
+
+    assert json.dumps(obj, compress=True) == stdlib_dumps(obj)
+
+
+def test_dumps_random_floats_equivalence(orjson_backend):
+
+    rnd = random.Random(0)
+
+    for _ in range(10000):
+        value = rnd.uniform(-1, 1) * 10 ** rnd.randint(-30, 30)
+        assert json.dumps({'value': value}, compress=True) == stdlib_dumps({'value': value})
+
+
+def test_dumps_orjson_used(orjson_backend, monkeypatch):
+
+    monkeypatch.setattr(json.json, 'dumps', None)
+
+    assert json.dumps({'host': 'localhost', 'port': 5432}, compress=True) == '{"host":"localhost","port":5432}'
+
+
+def test_dumps_unserializable(orjson_backend):
+
+    with pytest.raises(TypeError):
+        json.dumps({'set': {1, 2}}, compress=True)
+
+
+@pytest.mark.parametrize('obj', objects)
+def test_loads_equivalence(obj, orjson_backend):
+
+    s = stdlib_dumps(obj)
+
+    assert stdlib_json.dumps(json.loads(s)) == stdlib_json.dumps(stdlib_json.loads(s))
+
+
+@pytest.mark.parametrize('s', [
+    '{"value": NaN}',
+    '{"value": 1e400}',
+    '{"value": 123456789012345678901234567890}',
+    '{"value": "\\ud800"}',
+])
+def test_loads_stdlib_fallback(s, orjson_backend):
+
+    assert repr(json.loads(s)) == repr(stdlib_json.loads(s))
+
+
+def test_loads_bytes(orjson_backend):
+
+    assert json.loads(b'{"big": 123456789012345678901234567890, "host": "localhost"}') == {
+        'big': 123456789012345678901234567890,
+        'host': 'localhost',
+    }
+    assert json.loads('{"host": "Привет"}'.encode()) == {'host': 'Привет'}
+
+
+def test_loads_invalid(orjson_backend):
+
+    with pytest.raises(json.JSONLoadError):
+        json.loads('{invalid')
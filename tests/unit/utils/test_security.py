@@ -1,3 +1,7 @@
+from unittest import mock
+
+import pytest
+from cryptography.fernet import InvalidToken
 from django.test import override_settings
 
 from configfactory.utils import security
@@ -53,6 +57,31 @@ def test_enabled_encryptor():
     assert security.encrypt_data('TEST') != 'TEST'
 
 
+@override_settings(ENCRYPT_ENABLED=True)
+def test_encryptor_decrypt_cached():
+
+    encrypted = security.encrypt_data('TEST')
+
+    with mock.patch.object(security.FernetDataEncryptor, 'decrypt', autospec=True,
+                           side_effect=security.FernetDataEncryptor.decrypt) as decrypt:
+        assert security.decrypt_data(encrypted) == 'TEST'
+        assert security.decrypt_data(encrypted) == 'TEST'
+
+    assert decrypt.call_count == 1
+
+
+@override_settings(ENCRYPT_ENABLED=True)
+def test_encryptor_key_rotation():
+
+    encrypted = security.encrypt_data('TEST')
+
+    assert security.decrypt_data(encrypted) == 'TEST'
+
+    with override_settings(ENCRYPT_TOKEN='x' * 32):
+        with pytest.raises(InvalidToken):
+            security.decrypt_data(encrypted)
+
+
 @override_settings(ENCRYPT_ENABLED=True, ENCRYPT_PREFIX='$$$:')
 def test_encrypt_dict():
 
@@ -117,3 +146,64 @@ def test_encrypt_dict_inner_list():
     decrypted_dict = security.decrypt(encrypted_dict, secure_keys=['tokens'])
 
     assert decrypted_dict['tokens'] == [1, 2, 3]
+
+
+def test_secure_key_policy_shared():
+
+    policy = security.get_secure_key_policy(['password', 'secret'])
+
+    assert security.get_secure_key_policy(('password', 'secret')) is policy
+    assert security.get_secure_key_policy(['password']) is not policy
+
+
+def test_secure_key_policy_subtree():
+
+    policy = security.SecureKeyPolicy(['^db\\.password', '^api'])
+
+    assert policy.matches(['db', 'password'])
+    assert policy.matches(['API', 'key'])
+    assert not policy.matches(['cache', 'password'])
+
+    assert policy.subtree([]) == policy.SOME
+    assert policy.subtree(['db']) == policy.SOME
+    assert policy.subtree(['db', 'password']) == policy.ALL
+    assert policy.subtree(['api']) == policy.ALL
+    assert policy.subtree(['cache']) == policy.NONE
+    assert policy.subtree(['db', 'host']) == policy.NONE
+    assert policy.prune is not None
+
+
+def test_secure_key_policy_unanchored():
+
+    policy = security.SecureKeyPolicy(['password', '^db$'])
+
+    assert policy.subtree(['cache']) == policy.SOME
+    assert policy.subtree(['db']) == policy.SOME
+    assert policy.subtree(['password']) == policy.SOME
+    assert policy.prune is None
+
+    assert security.SecureKeyPolicy(['password']).subtree(['password']) == policy.ALL
+
+
+def test_cleanse_skips_excluded_subtrees():
+
+    data = {
+        'db': {
+            'host': {'name': 'localhost'},
+            'password': 'secret',
+        },
+        'cache': {'password': '123'},
+    }
+
+    actual = security.cleanse(data, hidden=['^db\\.password'])
+
+    assert actual == {
+        'db': {
+            'host': {'name': 'localhost'},
+            'password': '*****',
+        },
+        'cache': {'password': '123'},
+    }
+    # Excluded subtrees are returned as is
+    assert actual['cache'] is data['cache']
+    assert actual['db']['host'] is data['db']['host']
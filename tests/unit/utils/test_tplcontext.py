@@ -148,6 +148,51 @@ def test_circular_inject_self_keys():
     assert str(exc) == 'Circular injections detected.'
 
 
+def test_circular_inject_cycle_path():
+
+    with pytest.raises(tplcontext.CircularInjectError) as exc_info:
+        tplcontext.inject('${a}', context={
+            'a': '${b}',
+            'b': 'b = ${c}',
+            'c': ['${d}', '${b}'],
+            'd': 'D',
+        })
+
+    assert exc_info.value.cycle == ['b', 'c', 'b']
+
+
+def test_circular_inject_ignore_exception():
+
+    actual = tplcontext.inject({'k': '${a}', 'c': 'c = ${c}'}, context={
+        'a': '${b}',
+        'b': '${a}',
+        'c': 'c = ${c}',
+    }, strict=False)
+
+    assert actual == {'k': '${a}', 'c': 'c = ${c}'}
+
+
+def test_inject_long_chain():
+
+    context = {'k0': 'value'}
+    for i in range(1, 3000):
+        context[f'k{i}'] = '${k%d}' % (i - 1)
+
+    assert tplcontext.inject('${k2999}', context=context) == 'value'
+
+
+def test_inject_resolves_key_once():
+
+    injector = tplcontext.Injector(context={
+        'a': 'A',
+        'b': '${a}:${a}',
+        'c': '${b}/${b}',
+    })
+
+    assert injector.inject('${c} ${c}') == 'A:A/A:A A:A/A:A'
+    assert injector.dependencies('c') == {'b'}
+
+
 def test_inject_dict():
 
     template = {
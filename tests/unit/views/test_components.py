@@ -31,6 +31,23 @@ class ComponentsViewsTestCase(TestCase):
 
         assert Component.objects.filter(alias='database').exists()
 
+    def test_create_component_reserved_alias(self):
+
+        self.client.force_login(UserFactory(is_superuser=True))
+
+        response = self.client.post('/components/create/', data={
+            'name': 'Events',
+            'alias': 'events',
+            'is_global': False,
+            'require_schema': False,
+        })
+
+        assert response.status_code == 200
+        assert response.context['form'].errors == {
+            'alias': ['Alias `events` is reserved.'],
+        }
+        assert not Component.objects.filter(alias='events').exists()
+
     def test_update_component(self):
 
         component = ComponentFactory(name='Database', alias='database')
@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from configfactory.models import Environment
+from configfactory.test.factories import UserFactory
+
+
+class EnvironmentsViewsTestCase(TestCase):
+
+    def test_create_environment(self):
+
+        self.client.force_login(UserFactory(is_superuser=True))
+
+        response = self.client.post('/environments/create/', data={
+            'name': 'QA',
+            'alias': 'qa',
+            'is_active': True,
+        })
+
+        assert response.status_code == 302
+        assert Environment.objects.filter(alias='qa').exists()
+
+    def test_create_environment_reserved_alias(self):
+
+        self.client.force_login(UserFactory(is_superuser=True))
+
+        response = self.client.post('/environments/create/', data={
+            'name': 'Batch',
+            'alias': 'batch',
+            'is_active': True,
+        })
+
+        assert response.status_code == 200
+        assert response.context['form'].errors == {
+            'alias': ['Alias `batch` is reserved.'],
+        }
+        assert not Environment.objects.filter(alias='batch').exists()